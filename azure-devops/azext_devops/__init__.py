@@ -17,33 +17,18 @@ class DevCommandsLoader(AzCommandsLoader):
         self.cli_ctx.register_event(event_name=EVENT_INVOKER_POST_PARSE_ARGS, handler=self.post_parse_args)
 
     def load_command_table(self, args):
-        from azext_devops.dev.admin.commands import load_admin_commands
-        load_admin_commands(self, args)
-        from azext_devops.dev.boards.commands import load_work_commands
-        load_work_commands(self, args)
-        from azext_devops.dev.pipelines.commands import load_build_commands
-        load_build_commands(self, args)
-        from azext_devops.dev.repos.commands import load_code_commands
-        load_code_commands(self, args)
-        from azext_devops.dev.team.commands import load_team_commands
-        load_team_commands(self, args)
-        from azext_devops.dev.artifacts.commands import load_package_commands
-        load_package_commands(self, args)
+        areas = _get_areas_for_command(args) if _is_cli_command_index_complete() else list(_AREAS)
+        for area in areas:
+            _load_area_function(area, 'commands')(self, args)
         return self.command_table
 
     def load_arguments(self, command):
-        from azext_devops.dev.admin.arguments import load_admin_arguments
-        load_admin_arguments(self, command)
-        from azext_devops.dev.boards.arguments import load_work_arguments
-        load_work_arguments(self, command)
-        from azext_devops.dev.pipelines.arguments import load_build_arguments
-        load_build_arguments(self, command)
-        from azext_devops.dev.repos.arguments import load_code_arguments
-        load_code_arguments(self, command)
-        from azext_devops.dev.team.arguments import load_team_arguments
-        load_team_arguments(self, command)
-        from azext_devops.dev.artifacts.arguments import load_package_arguments
-        load_package_arguments(self, command)
+        areas = _get_areas_for_command(command.split() if command else None)
+        if _SHARED_ARGUMENTS_AREA not in areas:
+            areas.append(_SHARED_ARGUMENTS_AREA)
+        for area in _AREAS:
+            if area in areas:
+                _load_area_function(area, 'arguments')(self, command)
 
     @staticmethod
     def post_parse_args(_cli_ctx, **kwargs):
@@ -56,4 +41,79 @@ class DevCommandsLoader(AzCommandsLoader):
             set_tracking_data(**kwargs)
 
 
+def _get_areas_for_command(args):
+    """Returns the areas to load for the command being invoked, using the generated command index.
+    Every area is returned when the command can not be matched, e.g. for 'az -h' or a mistyped group.
+    """
+    from azext_devops._command_index import COMMAND_INDEX
+    words = []
+    for arg in args or []:
+        if arg.startswith('-'):
+            break
+        words.append(arg.lower())
+    if not words:
+        return list(_AREAS)
+    matched_group = None
+    areas = set()
+    for group, group_areas in COMMAND_INDEX.items():
+        group_words = group.split()
+        if group_words == words[:len(group_words)]:
+            if matched_group is None or len(group_words) > len(matched_group.split()):
+                matched_group = group
+        elif words == group_words[:len(words)]:
+            # the command is a parent of this group, e.g. 'az devops -h' lists 'devops admin'
+            areas.update(group_areas)
+    if matched_group is not None:
+        areas.update(COMMAND_INDEX[matched_group])
+    if not areas:
+        return list(_AREAS)
+    return [area for area in _AREAS if area in areas]
+
+
+def _is_cli_command_index_complete():
+    """The CLI rebuilds its own command index from whatever command table we return, so only part of the
+    table may be loaded once that index already routes every top level group of this extension to it.
+    """
+    from azext_devops._command_index import COMMAND_INDEX
+    try:
+        from azure.cli.core._session import INDEX, EXTENSION_INDEX
+        indexes = [INDEX, EXTENSION_INDEX]
+    except ImportError:
+        try:
+            from azure.cli.core._session import INDEX
+            indexes = [INDEX]
+        except ImportError:
+            return False
+    top_level_groups = {group.split()[0] for group in COMMAND_INDEX}
+    found_index = False
+    for index in indexes:
+        command_index = index.get('commandIndex') or {}
+        if not command_index:
+            continue
+        for group in top_level_groups:
+            if __name__ not in command_index.get(group, []):
+                return False
+        found_index = True
+    return found_index
+
+
+def _load_area_function(area, module):
+    import importlib
+    area_module = importlib.import_module('azext_devops.dev.{}.{}'.format(area, module))
+    return getattr(area_module, _AREA_LOADERS[area][module])
+
+
+# areas are loaded in this order, later argument registrations override earlier ones
+_AREAS = ['admin', 'boards', 'pipelines', 'repos', 'team', 'artifacts']
+_AREA_LOADERS = {
+    'admin': {'commands': 'load_admin_commands', 'arguments': 'load_admin_arguments'},
+    'boards': {'commands': 'load_work_commands', 'arguments': 'load_work_arguments'},
+    'pipelines': {'commands': 'load_build_commands', 'arguments': 'load_build_arguments'},
+    'repos': {'commands': 'load_code_commands', 'arguments': 'load_code_arguments'},
+    'team': {'commands': 'load_team_commands', 'arguments': 'load_team_arguments'},
+    'artifacts': {'commands': 'load_package_commands', 'arguments': 'load_package_arguments'},
+}
+# team arguments register the shared organization/project/detect arguments for every top level group
+_SHARED_ARGUMENTS_AREA = 'team'
+
 COMMAND_LOADER_CLS = DevCommandsLoader
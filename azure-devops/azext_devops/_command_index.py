@@ -0,0 +1,66 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# Generated file, DO NOT EDIT
+# Regenerate with scripts/generateCommandIndex.py after changing command groups.
+# --------------------------------------------------------------------------------------------
+
+# Maps every command group to the dev areas (azext_devops.dev.<area>) whose commands.py registers it.
+COMMAND_INDEX = {
+    'artifacts universal': ['artifacts'],
+    'boards': ['boards'],
+    'boards area project': ['boards'],
+    'boards area team': ['boards'],
+    'boards iteration project': ['boards'],
+    'boards iteration team': ['boards'],
+    'boards work-item': ['boards'],
+    'boards work-item relation': ['boards'],
+    'devops': ['team'],
+    'devops admin banner': ['admin'],
+    'devops extension': ['team'],
+    'devops project': ['team'],
+    'devops security group': ['team'],
+    'devops security group membership': ['team'],
+    'devops security permission': ['team'],
+    'devops security permission namespace': ['team'],
+    'devops service-endpoint': ['team'],
+    'devops service-endpoint azurerm': ['team'],
+    'devops service-endpoint github': ['team'],
+    'devops team': ['team'],
+    'devops user': ['team'],
+    'devops wiki': ['team'],
+    'devops wiki page': ['team'],
+    'pipelines': ['pipelines'],
+    'pipelines agent': ['pipelines'],
+    'pipelines build': ['pipelines'],
+    'pipelines build definition': ['pipelines'],
+    'pipelines build tag': ['pipelines'],
+    'pipelines folder': ['pipelines'],
+    'pipelines pool': ['pipelines'],
+    'pipelines queue': ['pipelines'],
+    'pipelines release': ['pipelines'],
+    'pipelines release definition': ['pipelines'],
+    'pipelines runs': ['pipelines'],
+    'pipelines runs artifact': ['pipelines'],
+    'pipelines runs tag': ['pipelines'],
+    'pipelines variable': ['pipelines'],
+    'pipelines variable-group': ['pipelines'],
+    'pipelines variable-group variable': ['pipelines'],
+    'repos': ['repos'],
+    'repos import': ['repos'],
+    'repos policy': ['repos'],
+    'repos policy approver-count': ['repos'],
+    'repos policy build': ['repos'],
+    'repos policy case-enforcement': ['repos'],
+    'repos policy comment-required': ['repos'],
+    'repos policy file-size': ['repos'],
+    'repos policy merge-strategy': ['repos'],
+    'repos policy required-reviewer': ['repos'],
+    'repos policy work-item-linking': ['repos'],
+    'repos pr': ['repos'],
+    'repos pr policy': ['repos'],
+    'repos pr reviewer': ['repos'],
+    'repos pr work-item': ['repos'],
+    'repos ref': ['repos'],
+}
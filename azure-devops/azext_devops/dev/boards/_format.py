@@ -51,6 +51,18 @@ def transform_work_item_relations(result):
     return table_output
 
 
+def transform_work_item_bulk_table_output(result):
+    table_output = []
+    for item in result:
+        table_row = OrderedDict()
+        table_row['Line'] = item['line']
+        table_row['ID'] = item['id']
+        table_row['Status'] = item['status']
+        table_row['Error'] = item['error']
+        table_output.append(table_row)
+    return table_output
+
+
 def transform_work_items_table_output(result):
     table_output = []
     for item in result:
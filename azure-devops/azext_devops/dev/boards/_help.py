@@ -82,6 +82,20 @@ def load_boards_help():
                 az boards area team add --team 'ContosoTeam' --path '\\ContosoProject\\MyProjectAreaName'
     """
 
+    helps['boards work-item bulk'] = """
+    type: command
+    long-summary: Rows are sent concurrently and failed rows are logged as warnings as soon as they are known,
+                  use --verbose to log every row. Failed rows are reported with their error and do not stop the
+                  other rows.
+    examples:
+          - name: Create bugs from a CSV file with title, assigned-to and System.Tags columns.
+            text: |
+                az boards work-item bulk --file ./bugs.csv --type Bug --project ContosoProject
+          - name: Update the work items listed in a file with one JSON object per line.
+            text: |
+                az boards work-item bulk --file ./updates.ndjson --format ndjson
+    """
+
     helps['boards work-item relation'] = """
     type: group
     short-summary: Manage work item relations.
@@ -5,6 +5,7 @@
 
 from azure.cli.core.commands.parameters import get_enum_type, get_three_state_flag
 _EXPAND_TYPES = ['none', 'relations', 'fields', 'links', 'all']
+_BULK_FILE_FORMATS = ['csv', 'ndjson']
 
 
 def load_work_arguments(self, _):
@@ -20,6 +21,11 @@ def load_work_arguments(self, _):
         context.argument('fields', nargs='*', options_list=('--fields', '-f'))
         context.argument('description', options_list=('--description', '-d'))
 
+    with self.argument_context('boards work-item bulk') as context:
+        context.argument('file_path', options_list='--file')
+        context.argument('file_format', options_list='--format', arg_type=get_enum_type(_BULK_FILE_FORMATS))
+        context.argument('work_item_type', type=str, options_list='--type')
+
     with self.argument_context('boards work-item delete') as context:
         context.argument('yes', options_list=['--yes', '-y'], action='store_true',
                          help='Do not prompt for confirmation.')
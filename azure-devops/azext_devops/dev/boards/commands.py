@@ -7,6 +7,7 @@
 from azure.cli.core.commands import CliCommandType
 from azext_devops.dev.common.exception_handler import azure_devops_exception_handler
 from ._format import (transform_work_item_table_output,
+                      transform_work_item_bulk_table_output,
                       transform_work_item_artifact_link_type_table_output,
                       transform_work_item_query_result_table_output,
                       transform_work_item_relation_type_table_output,
@@ -50,6 +51,7 @@ def load_work_commands(self, _):
         g.command('work-item update', 'update_work_item', table_transformer=transform_work_item_table_output)
         g.command('work-item delete', 'delete_work_item',
                   confirmation='Are you sure you want to delete this work item?')
+        g.command('work-item bulk', 'bulk_work_items', table_transformer=transform_work_item_bulk_table_output)
 
         # query commands
         g.command('query', 'query_work_items', table_transformer=transform_work_item_query_result_table_output)
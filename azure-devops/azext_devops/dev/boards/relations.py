@@ -3,12 +3,18 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import re
+
 from knack.log import get_logger
 from knack.util import CLIError
+from msrest.exceptions import DeserializationError, SerializationError
+from azext_devops.devops_sdk.v5_0.work_item_tracking import models
 from azext_devops.devops_sdk.v5_0.work_item_tracking.models import (JsonPatchOperation, Wiql, 
                                                                     WorkItemRelation, WorkItemRelationType)
 
-from azext_devops.dev.common.services import (get_work_item_tracking_client,
+from azext_devops.dev.common.file_cache import get_cli_cache
+from azext_devops.dev.common.services import (get_model_serializers,
+                                              get_work_item_tracking_client,
                                               resolve_instance)
 
 logger = get_logger(__name__)
@@ -19,14 +25,14 @@ def get_relation_types_show(organization=None, detect=None):
     """
     organization = resolve_instance(detect=detect, organization=organization)
     client = get_work_item_tracking_client(organization)
-    return client.get_relation_types()
+    return _get_relation_types(client, organization, refresh=True)[0]
 
 def get_artifact_link_types_show(organization=None, detect=None):
     """ List artifact link types supported in the organization.
     """
     organization = resolve_instance(detect=detect, organization=organization)
     client = get_work_item_tracking_client(organization)
-    return client.get_work_artifact_link_types()
+    return _get_artifact_link_types(client, organization, refresh=True)[0]
 
 def add_relation(id, relation_type, target_id=None, target_url=None, artifact_link_type=None
                  , organization=None, detect=None):  # pylint: disable=redefined-builtin
@@ -40,10 +46,9 @@ def add_relation(id, relation_type, target_id=None, target_url=None, artifact_li
     patch_document = []
     client = get_work_item_tracking_client(organization)
 
-    relation_types_from_service = client.get_relation_types()
-    relation_type_system_name = get_system_relation_name(relation_types_from_service, relation_type)
-    artifact_link_types_from_service = client.get_work_artifact_link_types()
-    artifact_link_type_system_name = get_system_artifact_link_name(artifact_link_types_from_service, artifact_link_type)
+    relation_types_from_service, relation_type_system_name = _resolve_relation_type(client, organization,
+                                                                                    relation_type)
+    artifact_link_type_system_name = _resolve_artifact_link_type(client, organization, artifact_link_type)
 
     patch_document = []
     if target_id is not None:
@@ -89,24 +94,28 @@ def remove_relation(id, relation_type, target_id, organization=None, detect=None
     patch_document = []
     client = get_work_item_tracking_client(organization)
 
-    relation_types_from_service = client.get_relation_types()
-    relation_type_system_name = get_system_relation_name(relation_types_from_service, relation_type)
-    target_work_item_ids = target_id.split(',')
+    relation_types_from_service, relation_type_system_name = _resolve_relation_type(client, organization,
+                                                                                    relation_type)
+    try:
+        target_work_item_ids = set(int(target_work_item_id) for target_work_item_id in target_id.split(','))
+    except ValueError:
+        raise CLIError('Id(s) supplied in --target-id is not valid')
 
     main_work_item = client.get_work_item(id, expand='All')
 
     if main_work_item.relations:
-        for target_work_item_id in target_work_item_ids:
-            target_work_item = client.get_work_item(target_work_item_id, expand='All')
-            target_work_item_url = target_work_item.url
-
-            index = 0
-            for relation in main_work_item.relations:
-                if relation.rel == relation_type_system_name and relation.url == target_work_item_url:
-                    po = _create_patch_operation('remove', '/relations/{}'.format(index))
-                    patch_document.append(po)
-                    break
-                index = index + 1
+        # work item relation urls end with the id of the target, so targets do not need to be fetched
+        relation_indexes = {}
+        for index, relation in enumerate(main_work_item.relations):
+            target_match = _WORK_ITEM_URL_PATTERN.search(relation.url or '')
+            if target_match is not None:
+                relation_indexes.setdefault((relation.rel, int(target_match.group(1))), index)
+        indexes_to_remove = [relation_indexes[(relation_type_system_name, target_work_item_id)]
+                             for target_work_item_id in target_work_item_ids
+                             if (relation_type_system_name, target_work_item_id) in relation_indexes]
+        # remove from the end so earlier removals do not shift the indexes of later ones
+        for index in sorted(indexes_to_remove, reverse=True):
+            patch_document.append(_create_patch_operation('remove', '/relations/{}'.format(index)))
 
     if len(patch_document) != len(target_work_item_ids):
         raise CLIError('Id(s) supplied in --target-id is not valid')
@@ -125,7 +134,7 @@ def show_work_item(id, organization=None, detect=None):  # pylint: disable=redef
     client = get_work_item_tracking_client(organization)
 
     work_item = client.get_work_item(id, expand='All')
-    relation_types_from_service = client.get_relation_types()
+    relation_types_from_service = _get_relation_types(client, organization)[0]
     work_item = fill_friendly_name_for_relations_in_work_item(relation_types_from_service, work_item)
     return work_item
 
@@ -134,30 +143,81 @@ def fill_friendly_name_for_relations_in_work_item(relation_types_from_service, w
     if not wi.relations:
         return wi
 
+    friendly_names = {relation_type_from_service.reference_name: relation_type_from_service.name
+                      for relation_type_from_service in relation_types_from_service}
     for relation in wi.relations:
-        for relation_type_from_service in relation_types_from_service:
-            if relation_type_from_service.reference_name == relation.rel:
-                relation.rel = relation_type_from_service.name
+        relation.rel = friendly_names.get(relation.rel, relation.rel)
     return wi
 
 
 def get_system_relation_name(relation_types_from_service, relation_type):
-    for relation_type_from_service in relation_types_from_service:
-        if relation_type_from_service.name.lower() == relation_type.lower():
-            return relation_type_from_service.reference_name
+    system_names = {relation_type_from_service.name.lower(): relation_type_from_service.reference_name
+                    for relation_type_from_service in relation_types_from_service}
+    if relation_type.lower() in system_names:
+        return system_names[relation_type.lower()]
 
     raise CLIError("--relation-type is not valid. Use \"az boards work-item relation list-type\" " +
                    "command to list possible relation types in your project")
 
 def get_system_artifact_link_name(artifact_link_types_from_service, artifact_link_type):
     if artifact_link_type is not None:
-        for artifact_link_type_from_service in artifact_link_types_from_service:
-            if artifact_link_type_from_service.link_type.lower() == artifact_link_type.lower():
-                return artifact_link_type_from_service.link_type
+        link_types = {artifact_link_type_from_service.link_type.lower(): artifact_link_type_from_service.link_type
+                      for artifact_link_type_from_service in artifact_link_types_from_service}
+        if artifact_link_type.lower() in link_types:
+            return link_types[artifact_link_type.lower()]
 
         raise CLIError("--artifact-link-type is not valid. Use \"az boards work-item relation " +
                        "list-artifact-link-type\" command to list possible artifact link types in your project")
     return None
+
+
+def _resolve_relation_type(client, organization, relation_type):
+    """Returns the relation types of the organization and the reference name of relation_type."""
+    relation_types, cached = _get_relation_types(client, organization)
+    if cached and relation_type.lower() not in (item.name.lower() for item in relation_types):
+        # the relation type might have been added since the relation types were cached
+        relation_types = _get_relation_types(client, organization, refresh=True)[0]
+    return relation_types, get_system_relation_name(relation_types, relation_type)
+
+
+def _resolve_artifact_link_type(client, organization, artifact_link_type):
+    if artifact_link_type is None:
+        return None
+    artifact_link_types, cached = _get_artifact_link_types(client, organization)
+    if cached and artifact_link_type.lower() not in (item.link_type.lower() for item in artifact_link_types):
+        artifact_link_types = _get_artifact_link_types(client, organization, refresh=True)[0]
+    return get_system_artifact_link_name(artifact_link_types, artifact_link_type)
+
+
+def _get_relation_types(client, organization, refresh=False):
+    return _get_type_metadata(_relation_types_cache, organization, client.get_relation_types,
+                              '[WorkItemRelationType]', refresh)
+
+
+def _get_artifact_link_types(client, organization, refresh=False):
+    return _get_type_metadata(_artifact_link_types_cache, organization, client.get_work_artifact_link_types,
+                              '[WorkArtifactLink]', refresh)
+
+
+def _get_type_metadata(cache, organization, fetch, data_type, refresh):
+    """Returns the type metadata of the organization from the disk cache, or from the service on a miss.
+    :rtype: tuple of the metadata and whether it came from the cache
+    """
+    key = organization.lower()
+    if not refresh and cache[key]:
+        try:
+            logger.debug('File cache hit for %s on: %s', data_type, organization)
+            return get_model_serializers(models)[1].deserialize_data(cache[key], data_type), True
+        except DeserializationError as ex:
+            logger.debug(ex, exc_info=True)
+    value = fetch()
+    try:
+        cache[key] = get_model_serializers(models)[0].serialize_data(value, data_type)
+    except SerializationError as ex:
+        logger.debug(ex, exc_info=True)
+    return value, False
+
+
 def _create_patch_operation(op, path, rel=None, url=None, artifact_link_type=None):
     patch_operation = JsonPatchOperation()
     patch_operation.op = op
@@ -171,3 +231,9 @@ def _create_patch_operation(op, path, rel=None, url=None, artifact_link_type=Non
     patch_operation.value = work_item_relation
 
     return patch_operation
+
+
+_WORK_ITEM_URL_PATTERN = re.compile(r'/_apis/wit/workItems/(\d+)$', re.IGNORECASE)
+# organization -> relation and artifact link types, which only change when an administrator customizes them
+_relation_types_cache = get_cli_cache('work_item_relation_types', 3600 * 24 * 7)
+_artifact_link_types_cache = get_cli_cache('work_item_artifact_link_types', 3600 * 24 * 7)
@@ -4,15 +4,24 @@
 # --------------------------------------------------------------------------------------------
 
 from __future__ import print_function
+import csv
+import io
+import json
+import os
+import time
 import webbrowser
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
 from knack.log import get_logger
 from knack.util import CLIError
-from azext_devops.devops_sdk.exceptions import AzureDevOpsServiceError
-from azext_devops.devops_sdk.v5_0.work_item_tracking.models import JsonPatchOperation, Wiql
+from msrest.exceptions import ClientRequestError
+from azext_devops.devops_sdk.exceptions import AzureDevOpsClientRequestError, AzureDevOpsServiceError
+from azext_devops.devops_sdk.v5_0.work_item_tracking.models import (JsonPatchOperation, Wiql,
+                                                                    WorkItemBatchGetRequest)
 from azext_devops.dev.common.arguments import convert_date_string_to_iso8601
 from azext_devops.dev.common.identities import (ME, get_current_identity,
                                                 resolve_identity,
+                                                resolve_identities,
                                                 get_account_from_identity)
 from azext_devops.dev.common.services import (get_work_item_tracking_client,
                                               resolve_instance,
@@ -163,6 +172,178 @@ def update_work_item(id, title=None, description=None, assigned_to=None, state=N
     return work_item
 
 
+def bulk_work_items(file_path, file_format=None, work_item_type=None, organization=None, project=None,
+                    detect=None):
+    """Create or update work items in bulk from a CSV or NDJSON file.
+    :param file_path: Path of a CSV file with a header row, or of a file with one JSON object per line.
+    Rows with an "id" column update that work item, other rows create a work item. The "type", "title",
+    "description", "assigned-to", "state", "area", "iteration", "reason" and "discussion" columns set the
+    matching work item attributes, any other column is the reference name of a field to set (e.g. System.Tags).
+    Empty cells and null values are left unset.
+    :type file_path: str
+    :param file_format: Format of the file. Defaults to csv for .csv files and ndjson otherwise.
+    :type file_format: str
+    :param work_item_type: Type of the work items created by rows without a "type" column (e.g. Bug).
+    :type work_item_type: str
+    :rtype: list of dict
+    """
+    organization, project = resolve_instance_and_project(
+        detect=detect, organization=organization, project=project, project_required=False)
+    if not os.path.isfile(file_path):
+        raise CLIError('File {} does not exist.'.format(file_path))
+    if file_format is None:
+        file_format = 'csv' if file_path.lower().endswith('.csv') else 'ndjson'
+    client = get_work_item_tracking_client(organization)
+    assignees = _resolve_bulk_assignees(file_path, file_format, organization)
+    results = []
+    pending = set()
+    with ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_BULK_REQUESTS) as executor:
+        for line, row in _read_bulk_rows(file_path, file_format):
+            try:
+                request = _create_bulk_request(row, work_item_type, project, assignees)
+            except (CLIError, ValueError) as ex:
+                results.append(_report_bulk_result(line, None, 'failed', str(ex)))
+                continue
+            pending.add(executor.submit(_send_bulk_request, client, line, request))
+            if len(pending) >= _MAX_CONCURRENT_BULK_REQUESTS * 2:
+                # keep the file streaming in without queuing every row at once
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in done)
+        results.extend(future.result() for future in as_completed(pending))
+    failed = sum(1 for result in results if result['status'] == 'failed')
+    if failed:
+        logger.warning('%s of %s rows failed.', failed, len(results))
+    return sorted(results, key=lambda result: result['line'])
+
+
+def _read_bulk_rows(file_path, file_format):
+    """Yields (line number, row) for every row of the file. Rows that cannot be parsed are yielded as the error."""
+    with io.open(file_path, 'r', encoding='utf-8-sig', newline='') as bulk_file:
+        if file_format == 'csv':
+            reader = csv.DictReader(bulk_file)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, ValueError('The row has more values than the header row has columns.')
+                else:
+                    yield reader.line_num, {key: value for key, value in row.items() if value}
+            return
+        for line, content in enumerate(bulk_file, 1):
+            if not content.strip():
+                continue
+            try:
+                row = json.loads(content)
+            except ValueError as ex:
+                yield line, ValueError('Invalid JSON: {}'.format(ex))
+                continue
+            if not isinstance(row, dict):
+                yield line, ValueError('Each line should be a JSON object.')
+            else:
+                yield line, {key: value for key, value in row.items() if value is not None}
+
+
+def _resolve_bulk_assignees(file_path, file_format, organization):
+    """Resolves the distinct assigned-to values of a bulk file in one pass, looking identities up concurrently.
+    :rtype: dict mapping each value to the account to assign, or to the CLIError it could not be resolved with
+    """
+    assignees = set()
+    for _, row in _read_bulk_rows(file_path, file_format):
+        if isinstance(row, dict):
+            assignees.update(str(value).strip() for column, value in row.items()
+                             if _get_bulk_column_name(column) == 'assigned-to')
+    # names and emails are assigned as they are, like _resolve_identity_as_unique_user_id does
+    accounts = {assignee: assignee for assignee in assignees
+                if assignee == '' or assignee.find(' ') > 0 or assignee.find('@') > 0}
+    identities = resolve_identities(sorted(assignees.difference(accounts)), organization, return_errors=True)
+    for assignee, identity in identities.items():
+        if identity is None or isinstance(identity, CLIError):
+            accounts[assignee] = identity
+        else:
+            accounts[assignee] = get_account_from_identity(identity)
+    return accounts
+
+
+def _get_bulk_column_name(column):
+    return column.strip().lower().replace('_', '-')
+
+
+def _create_bulk_request(row, work_item_type, project, assignees):
+    """Builds the (id, type, project, patch document) to send for a row of a bulk file.
+    :param dict assignees: The accounts of the assigned-to values of the file, see _resolve_bulk_assignees.
+    """
+    if isinstance(row, Exception):
+        raise row
+    work_item_id = None
+    patch_document = []
+    for column, value in row.items():
+        name = _get_bulk_column_name(column)
+        if name == 'id':
+            work_item_id = int(value)
+        elif name == 'type':
+            work_item_type = value
+        elif name == 'assigned-to':
+            # 'assigned to' does not take an identity id.  Display name works.
+            assigned_to = assignees[str(value).strip()]
+            if isinstance(assigned_to, CLIError):
+                raise assigned_to
+            if assigned_to is not None:
+                patch_document.append(_create_work_item_field_patch_operation('add', 'System.AssignedTo',
+                                                                              assigned_to))
+        elif name in _BULK_FIELD_COLUMNS:
+            patch_document.append(_create_work_item_field_patch_operation('add', _BULK_FIELD_COLUMNS[name], value))
+        else:
+            patch_document.append(_create_work_item_field_patch_operation('add', column.strip(), value))
+    if work_item_id is None:
+        if not any(operation.path == '/fields/System.Title' for operation in patch_document):
+            raise ValueError('A title is required to create a work item.')
+        if not work_item_type:
+            raise ValueError('A type column or the --type argument is required to create a work item.')
+        if project is None:
+            raise ValueError('The --project argument must be specified to create work items.')
+    elif not patch_document:
+        raise ValueError('There are no fields to update.')
+    return work_item_id, work_item_type, project, patch_document
+
+
+def _send_bulk_request(client, line, request):
+    work_item_id, work_item_type, project, patch_document = request
+    attempt = 0
+    while True:
+        try:
+            if work_item_id is None:
+                work_item = client.create_work_item(document=patch_document, project=project, type=work_item_type)
+                return _report_bulk_result(line, work_item.id, 'created')
+            work_item = client.update_work_item(document=patch_document, id=work_item_id)
+            return _report_bulk_result(line, work_item.id, 'updated')
+        except AzureDevOpsServiceError as ex:
+            try:
+                _handle_vsts_service_error(ex)
+            except CLIError as cli_error:
+                return _report_bulk_result(line, work_item_id, 'failed', str(cli_error))
+        except AzureDevOpsClientRequestError as ex:
+            # the service replied with an error status, sending the row again would not change the reply
+            return _report_bulk_result(line, work_item_id, 'failed', str(ex))
+        except ClientRequestError as ex:
+            # throttled requests are already retried by the client, this only retries failed connections.
+            # A create might have gone through before its connection failed, so only updates are retried.
+            attempt += 1
+            if work_item_id is None or attempt >= _BULK_UPDATE_ATTEMPTS:
+                return _report_bulk_result(line, work_item_id, 'failed', str(ex))
+            logger.debug(ex, exc_info=True)
+            time.sleep(2 ** attempt)
+        except Exception as ex:  # pylint: disable=broad-except
+            # e.g. an authentication error, report it on the row instead of dropping the results of the others
+            logger.debug(ex, exc_info=True)
+            return _report_bulk_result(line, work_item_id, 'failed', str(ex))
+
+
+def _report_bulk_result(line, work_item_id, status, error=None):
+    if status == 'failed':
+        logger.warning('Line %s: failed. %s', line, error)
+    else:
+        logger.info('Line %s: %s work item %s.', line, status, work_item_id)
+    return {'line': line, 'id': work_item_id, 'status': status, 'error': error}
+
+
 def delete_work_item(id,  # pylint: disable=redefined-builtin
                      destroy=False, organization=None, project=None, detect=None):
     """Delete a work item.
@@ -266,76 +447,52 @@ def query_work_items(wiql=None, id=None, path=None, organization=None, project=N
         query_result = client.query_by_wiql(wiql=wiql_object)
     if query_result.work_items:
         _last_query_result[_LAST_QUERY_RESULT_KEY] = query_result  # store query result for table view
-        safety_buffer = 100  # a buffer in the max url length to protect going over the limit
-        remaining_url_length = 2048 - safety_buffer
-        remaining_url_length -= len(organization)
-        # following subtracts relative url, the asof parameter and beginning of id and field parameters.
-        # asof value length will vary, but this should be the longest possible
-        remaining_url_length -=\
-            len('/_apis/wit/workItems?ids=&fields=&asOf=2017-11-07T17%3A05%3A34.06699999999999999Z')
-        fields = []
-        fields_length_in_url = 0
+        fields = None
         if query_result.columns:
-            for field_ref in query_result.columns:
-                fields.append(field_ref.reference_name)
-                if fields_length_in_url > 0:
-                    fields_length_in_url += 3  # add 3 for %2C delimiter
-                fields_length_in_url += len(uri_quote(field_ref.reference_name))
-                if fields_length_in_url > 800:
-                    logger.info("Not retrieving all fields due to max url length.")
-                    break
-        remaining_url_length -= fields_length_in_url
-        max_work_items = 1000
-        work_items_batch_size = 200
-        current_batch = []
-        work_items = []
-        work_item_url_length = 0
-        for work_item_ref in query_result.work_items:
-            if len(work_items) >= max_work_items:
-                logger.info("Only retrieving the first %s work items.", max_work_items)
-                break
-            if work_item_url_length > 0:
-                work_item_url_length += 3  # add 3 for %2C delimiter
-            work_item_url_length += len(str(work_item_ref.id))
-            current_batch.append(work_item_ref.id)
-
-            if remaining_url_length - work_item_url_length <= 0 or len(current_batch) == work_items_batch_size:
-                # url is near max length, go ahead and send first request for details.
-                # url can go over by an id length because we have a safety buffer
-                current_batched_items = client.get_work_items(ids=current_batch,
-                                                              as_of=query_result.as_of,
-                                                              fields=fields)
-                for work_item in current_batched_items:
-                    work_items.append(work_item)
-                current_batch = []
-                work_item_url_length = 0
-
-        if current_batch:
-            current_batched_items = client.get_work_items(ids=current_batch,
-                                                          as_of=query_result.as_of,
-                                                          fields=fields)
-            for work_item in current_batched_items:
-                work_items.append(work_item)
+            fields = [field_ref.reference_name for field_ref in query_result.columns]
+        ids = [work_item_ref.id for work_item_ref in query_result.work_items]
         # put items in the same order they appeared in the initial query results
-        work_items = sorted(work_items, key=_get_sort_key_from_last_query_results)
-        return work_items
+        positions = {work_item_id: position for position, work_item_id in enumerate(ids)}
+        work_items = [None] * len(ids)
+        for batch in _iter_work_item_batches(client, ids, fields, query_result.as_of):
+            for work_item in batch:
+                if work_item.id not in positions:
+                    # following lines should never be reached
+                    raise CLIError("Work Item {} was not found in the original query results."
+                                   .format(work_item.id))
+                work_items[positions[work_item.id]] = work_item
+        return [work_item for work_item in work_items if work_item is not None]
     return None
 
 
-def _get_sort_key_from_last_query_results(work_item):
-    work_items = get_last_query_result().work_items
-    i = 0
-    num_items = len(work_items)
-    while i < num_items:
-        if work_items[i].id == work_item.id:
-            return i
-        i += 1
-    # following lines should never be reached
-    raise CLIError("Work Item {} was not found in the original query results.".format(work_item.id))
+def _iter_work_item_batches(client, ids, fields, as_of):
+    """Gets the work items with the given ids through the work items batch endpoint, several batches at a time.
+    Yields each batch of work items as soon as it arrives, so batches are not yielded in the order of ids.
+    """
+    batches = [ids[i:i + _WORK_ITEMS_BATCH_SIZE] for i in range(0, len(ids), _WORK_ITEMS_BATCH_SIZE)]
+
+    def get_batch(batch_ids):
+        request = WorkItemBatchGetRequest(ids=batch_ids, fields=fields, as_of=as_of)
+        return client.get_work_items_batch(work_item_get_request=request)
+
+    if len(batches) == 1:
+        yield get_batch(batches[0])
+        return
+    with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_BATCHES, len(batches))) as executor:
+        futures = [executor.submit(get_batch, batch_ids) for batch_ids in batches]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
 
 
 _last_query_result = {}
 _LAST_QUERY_RESULT_KEY = 'value'
+# the work items batch endpoint accepts at most 200 ids per request
+_WORK_ITEMS_BATCH_SIZE = 200
+_MAX_CONCURRENT_BATCHES = 8
 
 
 def get_last_query_result():
@@ -382,6 +539,17 @@ def _resolve_identity_as_unique_user_id(identity_filter, organization):
     return None
 
 
+# bulk file columns, besides id and type, that set the same fields as the create and update arguments
+_BULK_FIELD_COLUMNS = {'title': 'System.Title',
+                       'description': 'System.Description',
+                       'state': 'System.State',
+                       'area': 'System.AreaPath',
+                       'iteration': 'System.IterationPath',
+                       'reason': 'System.Reason',
+                       'discussion': 'System.History'}
+_MAX_CONCURRENT_BULK_REQUESTS = 8
+_BULK_UPDATE_ATTEMPTS = 3
+
 _SYSTEM_FIELD_ARGS = {'System.Title': 'title',
                       'System.Description': 'description',
                       'System.AssignedTo': 'assigned-to',
@@ -8,7 +8,7 @@ import os
 
 from knack.log import get_logger
 
-from azext_devops.dev.common.services import _get_credentials
+from azext_devops.dev.common.services import get_connection
 from azext_devops.dev.common.const import ARTIFACTTOOL_PAT_ENVKEY
 
 logger = get_logger(__name__)
@@ -58,7 +58,7 @@ class ArtifactToolInvoker:
         artifacttool_binary_path = os.path.join(artifacttool_dir, "artifacttool")
 
         # Populate the environment for the process with the PAT
-        creds = _get_credentials(organization)
+        creds = get_connection(organization).credentials
         new_env = os.environ.copy()
         new_env[ARTIFACTTOOL_PAT_ENVKEY] = str(creds.password)
 
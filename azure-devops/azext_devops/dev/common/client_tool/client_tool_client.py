@@ -3,7 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from msrest import Serializer, Deserializer
 from azext_devops.devops_sdk.client import Client
 
 from . import models
@@ -12,9 +11,7 @@ from . import models
 class ClientToolClient(Client):
     def __init__(self, base_url=None, creds=None):
         super(ClientToolClient, self).__init__(base_url, creds)
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize, self._deserialize = self._get_model_registry(models)
 
     resource_area_identifier = '3fda18ba-dff2-42e6-8d10-c521b23b85fc'
 
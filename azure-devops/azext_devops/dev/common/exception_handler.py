@@ -19,6 +19,9 @@ def azure_devops_exception_handler(ex):
 
     if exceptionTypeName == 'AzureDevOpsAuthenticationError':
         logger.debug('handling vsts auth error')
+        # the cached az login tenant may no longer have access, find a working one on the next run
+        from .services import forget_cached_tenants
+        forget_cached_tenants()
         raise CLIError(ex)
 
     if exceptionTypeName == 'ValueError':
@@ -9,6 +9,7 @@ import sys
 from knack.log import get_logger
 from knack.util import CLIError
 from .uri import uri_parse
+from .git_config import read_current_branch_name, read_git_remotes, UnsupportedGitSetupError
 
 logger = get_logger(__name__)
 
@@ -43,6 +44,10 @@ def fetch_remote_and_checkout(refName, remote_name):
 
 
 def get_current_branch_name():
+    try:
+        return read_current_branch_name()
+    except (UnsupportedGitSetupError, IOError, OSError) as ex:
+        logger.debug('GitDetect: Reading HEAD failed, falling back to git: %s', ex)
     try:
         output = subprocess.check_output([_GIT_EXE, 'symbolic-ref', '--short', '-q', 'HEAD'])
     except BaseException as ex:  # pylint: disable=broad-except
@@ -96,6 +101,15 @@ def get_git_credentials(organization):
 def get_git_remotes():
     if _git_remotes:
         return _git_remotes
+    try:
+        remotes = read_git_remotes()
+        if remotes is None:
+            logger.info('GitDetect: Could not detect current remotes based on current working directory.')
+            return None
+        _git_remotes.update(remotes)
+        return _git_remotes
+    except (UnsupportedGitSetupError, IOError, OSError) as ex:
+        logger.debug('GitDetect: Reading git config failed, falling back to git: %s', ex)
     try:
         # Example output:
         # git remote - v
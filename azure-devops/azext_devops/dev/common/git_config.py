@@ -0,0 +1,249 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Reads the remotes and the current branch of a git repository straight from its git directory.
+
+This avoids starting a git process on every command that auto-detects its organization. Setups that the
+reader cannot reproduce exactly (GIT_DIR overrides, url rewrites, remotes defined in global config, ...)
+raise UnsupportedGitSetupError so callers can fall back to the git executable.
+"""
+
+import os
+import re
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class UnsupportedGitSetupError(Exception):
+    pass
+
+
+def read_git_remotes(path=None):
+    """Returns the remotes of the repository containing path, keyed like the output of `git remote -v`,
+    e.g. {'origin(fetch)': url, 'origin(push)': url}. Returns None when path is not in a repository.
+    """
+    git_dirs = find_git_dirs(path)
+    if git_dirs is None:
+        return None
+    common_dir = git_dirs[1]
+    config_files = [os.path.join(common_dir, 'config')] + _get_global_config_files()
+    stamp = _get_stamp(config_files)
+    cached = _remotes_cache.get(common_dir)
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+    remotes = _read_remotes(config_files[0], config_files[1:])
+    _remotes_cache[common_dir] = (stamp, remotes)
+    return dict(remotes)
+
+
+def read_current_branch_name(path=None):
+    """Returns the branch HEAD points to, like `git symbolic-ref --short -q HEAD`.
+    Returns None when path is not in a repository or HEAD is detached.
+    """
+    git_dirs = find_git_dirs(path)
+    if git_dirs is None:
+        return None
+    head_file = os.path.join(git_dirs[0], 'HEAD')
+    stamp = _get_stamp([head_file])
+    cached = _head_cache.get(head_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(head_file, 'r') as head:
+        content = head.read().strip()
+    if not content.startswith('ref:'):
+        branch = None
+    else:
+        ref = content[len('ref:'):].strip()
+        if not ref.startswith(_REF_HEADS_PREFIX):
+            raise UnsupportedGitSetupError('HEAD points to {}'.format(ref))
+        branch = ref[len(_REF_HEADS_PREFIX):]
+    _head_cache[head_file] = (stamp, branch)
+    return branch
+
+
+def find_git_dirs(path=None):
+    """Finds the repository containing path the way git does.
+    :rtype: tuple of the git dir (holding HEAD) and the common dir (holding config), or None
+    """
+    for variable in ('GIT_DIR', 'GIT_WORK_TREE', 'GIT_COMMON_DIR', 'GIT_CEILING_DIRECTORIES'):
+        if os.environ.get(variable):
+            raise UnsupportedGitSetupError('{} is set'.format(variable))
+    path = os.path.abspath(path or os.getcwd())
+    cached = _git_dirs_cache.get(path)
+    if cached is not None:
+        return cached
+    current = path
+    while True:
+        dot_git = os.path.join(current, '.git')
+        if os.path.isdir(dot_git):
+            git_dir = dot_git
+            break
+        if os.path.isfile(dot_git):
+            git_dir = _read_gitdir_file(dot_git)
+            break
+        if _is_git_dir(current):
+            # bare repository, or the working directory is inside the .git directory
+            git_dir = current
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+    common_dir = git_dir
+    commondir_file = os.path.join(git_dir, 'commondir')
+    if os.path.isfile(commondir_file):
+        with open(commondir_file, 'r') as commondir:
+            common_dir = os.path.normpath(os.path.join(git_dir, commondir.read().strip()))
+    _git_dirs_cache[path] = (git_dir, common_dir)
+    return git_dir, common_dir
+
+
+def _is_git_dir(path):
+    return (os.path.isfile(os.path.join(path, 'HEAD')) and os.path.isdir(os.path.join(path, 'objects')) and
+            os.path.isdir(os.path.join(path, 'refs')))
+
+
+def _read_gitdir_file(dot_git_file):
+    # worktrees and submodules use a .git file containing "gitdir: <path>"
+    with open(dot_git_file, 'r') as gitdir_file:
+        content = gitdir_file.read().strip()
+    if not content.startswith('gitdir:'):
+        raise UnsupportedGitSetupError('Unexpected content in {}'.format(dot_git_file))
+    git_dir = content[len('gitdir:'):].strip()
+    return os.path.normpath(os.path.join(os.path.dirname(dot_git_file), git_dir))
+
+
+def _get_global_config_files():
+    files = [os.path.expanduser(os.path.join('~', '.gitconfig'))]
+    xdg_config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser(os.path.join('~', '.config'))
+    files.append(os.path.join(xdg_config_home, 'git', 'config'))
+    return files
+
+
+def _get_stamp(files):
+    stamp = []
+    for file_name in files:
+        try:
+            stat = os.stat(file_name)
+            stamp.append((stat.st_mtime, stat.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _read_remotes(local_config_file, global_config_files):
+    urls = {}
+    push_urls = {}
+    for section, subsection, key, value in _read_config_file(local_config_file, allow_remotes=True):
+        if section == 'remote' and subsection is not None and value is not None:
+            if key == 'url':
+                urls.setdefault(subsection, []).append(value)
+            elif key == 'pushurl':
+                push_urls.setdefault(subsection, []).append(value)
+        elif section == 'extensions' and key == 'worktreeconfig':
+            raise UnsupportedGitSetupError('worktree specific config is enabled')
+    for config_file in global_config_files:
+        if os.path.isfile(config_file):
+            for _ in _read_config_file(config_file, allow_remotes=False):
+                pass
+    remotes = {}
+    for name, remote_urls in urls.items():
+        remotes[name + '(fetch)'] = remote_urls[0]
+        # git remote -v lists every push url, the last one wins like it does for the subprocess output
+        remotes[name + '(push)'] = push_urls.get(name, remote_urls)[-1]
+    return remotes
+
+
+def _read_config_file(config_file, allow_remotes, depth=0):
+    """Yields (section, subsection, key, value) for every entry of a git config file and the files it includes.
+    Raises UnsupportedGitSetupError for syntax and features this reader does not handle.
+    """
+    if depth > _MAX_INCLUDE_DEPTH:
+        raise UnsupportedGitSetupError('Too many nested includes in {}'.format(config_file))
+    with open(config_file, 'r') as config:
+        lines = config.read().splitlines()
+    section = subsection = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith('['):
+            match = _SECTION_PATTERN.match(line)
+            if match is None:
+                raise UnsupportedGitSetupError('Unsupported section header in {}: {}'.format(config_file, line))
+            section = match.group(1).lower()
+            subsection = _unescape(match.group(2)) if match.group(2) is not None else None
+            if subsection is None and '.' in section:
+                # deprecated [section.subsection] syntax
+                section, subsection = section.split('.', 1)
+            if section == 'url':
+                raise UnsupportedGitSetupError('url rewrites are configured in {}'.format(config_file))
+            if section == 'remote' and not allow_remotes:
+                raise UnsupportedGitSetupError('remotes are configured in {}'.format(config_file))
+            continue
+        if section is None:
+            raise UnsupportedGitSetupError('Entry outside of a section in {}'.format(config_file))
+        key, value = _parse_entry(line, config_file)
+        if section in ('include', 'includeif') and key == 'path' and value:
+            include_file = os.path.expanduser(value)
+            if not os.path.isabs(include_file):
+                include_file = os.path.join(os.path.dirname(config_file), include_file)
+            if os.path.isfile(include_file):
+                # included remotes or rewrites might apply, so they are not supported whatever the condition
+                for entry in _read_config_file(include_file, allow_remotes=False, depth=depth + 1):
+                    yield entry
+            continue
+        yield section, subsection, key, value
+
+
+def _parse_entry(line, config_file):
+    match = _KEY_PATTERN.match(line)
+    if match is None:
+        raise UnsupportedGitSetupError('Unsupported entry in {}: {}'.format(config_file, line))
+    key = match.group(1).lower()
+    rest = match.group(2)
+    if not rest:
+        return key, None
+    if not rest.startswith('='):
+        raise UnsupportedGitSetupError('Unsupported entry in {}: {}'.format(config_file, line))
+    value = []
+    in_quotes = False
+    index = 1
+    while index < len(rest):
+        char = rest[index]
+        if char == '\\':
+            if index + 1 >= len(rest):
+                raise UnsupportedGitSetupError('Line continuations are not supported in {}'.format(config_file))
+            if rest[index + 1] not in _ESCAPES:
+                raise UnsupportedGitSetupError('Unsupported escape sequence in {}'.format(config_file))
+            value.append(_ESCAPES[rest[index + 1]])
+            index += 2
+            continue
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char in '#;' and not in_quotes:
+            break
+        else:
+            value.append(char)
+        index += 1
+    if in_quotes:
+        raise UnsupportedGitSetupError('Unterminated quote in {}'.format(config_file))
+    return key, ''.join(value).strip()
+
+
+def _unescape(subsection):
+    return re.sub(r'\\(.)', r'\1', subsection)
+
+
+_SECTION_PATTERN = re.compile(r'^\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]\s*(?:[#;].*)?$')
+_KEY_PATTERN = re.compile(r'^([A-Za-z][A-Za-z0-9-]*)\s*(.*)$')
+_ESCAPES = {'\\': '\\', '"': '"', 'n': '\n', 't': '\t', 'b': '\b'}
+_MAX_INCLUDE_DEPTH = 10
+_REF_HEADS_PREFIX = 'refs/heads/'
+_git_dirs_cache = {}
+_remotes_cache = {}
+_head_cache = {}
@@ -3,11 +3,16 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
+from knack.log import get_logger
 from knack.util import CLIError
 from .file_cache import get_cli_cache
 from .uuid import is_uuid
-from .services import get_connection_data, get_identity_client
+from .services import get_connection_data, get_identity_client, get_model_serializers
+
+logger = get_logger(__name__)
 
 
 def resolve_identity_as_id(identity_filter, organization):
@@ -47,6 +52,64 @@ def resolve_identity_as_display_name(identity_filter, organization):
     return None
 
 
+def resolve_identities_as_ids(identity_filters, organization):
+    """Takes a list of identity names, emails, aliases, or ids, and returns their ids in the same order.
+    Filters that are not cached are looked up concurrently, so a whole list costs at most one round of lookups.
+    """
+    if identity_filters is None:
+        return None
+    identities = resolve_identities([identity_filter for identity_filter in identity_filters
+                                     if identity_filter is not None and not is_uuid(identity_filter)],
+                                    organization)
+    resolved_ids = []
+    for identity_filter in identity_filters:
+        if identity_filter is None or is_uuid(identity_filter):
+            resolved_ids.append(identity_filter)
+        else:
+            identity = identities[identity_filter]
+            resolved_ids.append(identity.id if identity is not None else None)
+    return resolved_ids
+
+
+def resolve_identities(identity_filters, organization, return_errors=False):
+    """Takes a list of identity names, emails, aliases, or ids, and returns a dict mapping each filter to its
+    identity. Raises the error of the first filter, in list order, that could not be resolved, or with
+    return_errors maps each filter that could not be resolved to its CLIError instead.
+    """
+    identities = {}
+    to_look_up = []
+    for identity_filter in identity_filters:
+        if identity_filter in identities or identity_filter in to_look_up:
+            continue
+        if identity_filter is None:
+            identities[identity_filter] = None
+        elif identity_filter.lower() == ME:
+            identities[identity_filter] = get_current_identity(organization)
+        else:
+            identity = _get_cached_identity(identity_filter, organization)
+            if identity is not None:
+                identities[identity_filter] = identity
+            else:
+                to_look_up.append(identity_filter)
+    if not to_look_up:
+        return identities
+    identity_client = get_identity_client(organization)
+    search = functools.partial(_search_identity_or_error if return_errors else _search_identity, identity_client,
+                               organization=organization)
+    if len(to_look_up) == 1:
+        results = [search(to_look_up[0])]
+    else:
+        # the current identity is needed to pick between ambiguous matches, load it before fanning out
+        get_current_identity(organization)
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_LOOKUPS, len(to_look_up))) as executor:
+            results = list(executor.map(search, to_look_up))
+    for identity_filter, identity in zip(to_look_up, results):
+        if not isinstance(identity, CLIError):
+            _cache_identity(identity_filter, organization, identity)
+        identities[identity_filter] = identity
+    return identities
+
+
 def resolve_identity(identity_filter, organization):
     """Takes an identity name, email, alias, or id, and returns the identity.
     """
@@ -56,7 +119,16 @@ def resolve_identity(identity_filter, organization):
     if identity_filter.lower() == ME:
         return get_current_identity(organization)
 
+    identity = _get_cached_identity(identity_filter, organization)
+    if identity is not None:
+        return identity
     identity_client = get_identity_client(organization)
+    identity = _search_identity(identity_client, identity_filter, organization)
+    _cache_identity(identity_filter, organization, identity)
+    return identity
+
+
+def _search_identity(identity_client, identity_filter, organization):
     if identity_filter.find(' ') > 0 or identity_filter.find('@') > 0:
         identities = identity_client.read_identities(search_filter='General',
                                                      filter_value=identity_filter)
@@ -73,13 +145,11 @@ def resolve_identity(identity_filter, organization):
         raise CLIError('Could not resolve identity: ' + identity_filter)
     if len(identities) > 1:
         # prefer users with same domain
+        current_domain = _get_domain(get_current_identity(organization))
         identities_with_tenant = []
-        for identity in identities:
-            if 'Domain' in identity.properties and '$value' in identity.properties['Domain']:
-                current_user = get_current_identity(organization)
-                if 'Domain' in current_user.properties and '$value' in current_user.properties['Domain']\
-                        and identity.properties['Domain']['$value'] ==\
-                        current_user.properties['Domain']['$value']:
+        if current_domain is not None:
+            for identity in identities:
+                if _get_domain(identity) == current_domain:
                     identities_with_tenant.append(identity)
         if len(identities_with_tenant) == 1:
             return identities_with_tenant[0]
@@ -89,6 +159,51 @@ def resolve_identity(identity_filter, organization):
     return identities[0]
 
 
+def _search_identity_or_error(identity_client, identity_filter, organization):
+    try:
+        return _search_identity(identity_client, identity_filter, organization)
+    except CLIError as ex:
+        return ex
+
+
+def _get_domain(identity):
+    if 'Domain' in identity.properties and '$value' in identity.properties['Domain']:
+        return identity.properties['Domain']['$value']
+    return None
+
+
+def _get_identity_cache_key(identity_filter, organization):
+    return organization.lower() + '|' + identity_filter.lower()
+
+
+def _get_cached_identity(identity_filter, organization):
+    cache_key = _get_identity_cache_key(identity_filter, organization)
+    serialized = _identity_cache.get(cache_key)
+    if not serialized:
+        return None
+    from msrest.exceptions import DeserializationError
+    try:
+        logger.debug('File cache hit for identity: %s', identity_filter)
+        return _get_identity_serializers()[1].deserialize_data(serialized, 'Identity')
+    except DeserializationError as ex:
+        logger.debug(ex, exc_info=True)
+        return None
+
+
+def _cache_identity(identity_filter, organization, identity):
+    from msrest.exceptions import SerializationError
+    try:
+        _identity_cache[_get_identity_cache_key(identity_filter, organization)] =\
+            _get_identity_serializers()[0].serialize_data(identity, 'Identity')
+    except SerializationError as ex:
+        logger.debug(ex, exc_info=True)
+
+
+def _get_identity_serializers():
+    from azext_devops.devops_sdk.v5_0.identity import models
+    return get_model_serializers(models)
+
+
 def get_current_identity(organization):
     return get_connection_data(organization).authenticated_user
 
@@ -139,3 +254,6 @@ def get_identity_descriptor_from_subject_descriptor(subject_descriptor, organiza
 
 ME = 'me'
 _display_name_cache = get_cli_cache('identity_display_names', 3600 * 6)
+# organization|filter -> serialized identity the filter resolved to
+_identity_cache = get_cli_cache('identities', 3600 * 24)
+_MAX_CONCURRENT_LOOKUPS = 8
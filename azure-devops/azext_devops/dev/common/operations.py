@@ -13,6 +13,7 @@ def wait_for_long_running_operation(organization, operation_id, interval_seconds
     operation = operation_client.get_operation(operation_id)
     while not has_operation_completed(operation):
         time.sleep(interval_seconds)
+        operation_client.clear_request_cache()
         operation = operation_client.get_operation(operation_id)
     return operation
 
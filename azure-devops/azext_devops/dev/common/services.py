@@ -5,12 +5,15 @@
 
 import datetime
 import os
+import threading
 from collections import OrderedDict
+from six.moves import queue
 from msrest.authentication import BasicAuthentication
 from azure.cli.core._profile import Profile
 from knack.log import get_logger
 from knack.util import CLIError
 from azext_devops.devops_sdk.connection import Connection
+from azext_devops.devops_sdk.credentials import get_credential_fingerprint
 from azext_devops.version import VERSION
 from .arguments import should_detect
 from .const import (DEFAULTS_SECTION,
@@ -28,6 +31,7 @@ from .const import (DEFAULTS_SECTION,
                     PROJECT_PICKED_FROM_CONFIG,
                     PROJECT_IGNORED_FROM_CONFIG)
 from ._credentials import get_credential
+from .file_cache import DEFAULT_CACHE_DIR, get_cli_cache
 from .git import get_remote_url
 from .vsts_git_url_info import VstsGitUrlInfo
 from .uri import uri_parse_instance_from_git_uri, is_valid_url
@@ -52,8 +56,23 @@ def get_connection(organization):
 
 
 def _get_credentials(organization):
+    """Returns the credentials for the organization. They are only resolved once per organization in a process,
+    because resolving them can read the OS keyring or the PAT file and get az login tokens.
+    """
+    key = organization.lower()
+    if key not in _credentials:
+        _credentials[key] = _resolve_credentials(organization)
+    return _credentials[key]
+
+
+def _resolve_credentials(organization):
+    if PAT_ENV_VARIABLE_NAME in os.environ:
+        pat = os.environ[PAT_ENV_VARIABLE_NAME]
+        logger.info("received PAT from environment variable")
+    else:
+        pat = get_credential(organization)
     pat_token_present = False
-    if PAT_ENV_VARIABLE_NAME in os.environ or get_credential(organization) is not None:
+    if PAT_ENV_VARIABLE_NAME in os.environ or pat is not None:
         logger.debug("PAT is present which can be used against this instance")
         pat_token_present = True
 
@@ -66,11 +85,6 @@ def _get_credentials(organization):
         logger.debug("az login is not present")
         logger.debug(ex, exc_info=True)
 
-    if PAT_ENV_VARIABLE_NAME in os.environ:
-        pat = os.environ[PAT_ENV_VARIABLE_NAME]
-        logger.info("received PAT from environment variable")
-    else:
-        pat = get_credential(organization)
     if pat is not None:
         logger.info("Creating connection with personal access token.")
         credentials = BasicAuthentication('', pat)
@@ -131,25 +145,90 @@ def get_token_from_az_logins(organization, pat_token_present):
     if pat_token_present is False and len(tenantsDict) == 1:
         skipValidateToken = True
 
-    try:
-        for key, dummy_value in tenantsDict.items():
+    cached_key = _get_cached_tenant(organization)
+    if cached_key in tenantsDict:
+        # this tenant worked for the organization before, it is trusted until a request fails with a 401
+        logger.debug('trying cached tenant %s and user %s', cached_key[0], cached_key[1])
+        token = get_token_from_az_login(profile, cached_key[0])
+        if token:
+            _organizations_using_cached_tenant.add(organization)
+            return token
+        logger.debug('failed to get token for cached tenant %s', cached_key[0])
+        forget_cached_tenants([organization])
+        del tenantsDict[cached_key]
+
+    if skipValidateToken is True and tenantsDict:
+        key = next(iter(tenantsDict))
+        logger.debug('trying to get token (temp) for tenant %s and user %s ', key[0], key[1])
+        return get_token_from_az_login(profile, key[0])
+
+    key, token = _probe_tenants(organization, profile, list(tenantsDict))
+    if token:
+        _tenant_cache[organization] = {'tenantId': key[0], 'user': key[1]}
+        return token
+    return ''
+
+
+def _probe_tenants(organization, profile, tenant_keys):
+    """Gets and validates a token for every (tenant, user) pair concurrently.
+    Returns the first pair whose token works for the organization along with the token, or (None, None).
+    Probes not started yet are skipped once a token works; running ones are left to finish on daemon threads.
+    """
+    pending = queue.Queue()
+    for key in tenant_keys:
+        pending.put(key)
+    results = queue.Queue()
+    found = threading.Event()
+
+    def probe():
+        while not found.is_set():
+            try:
+                key = pending.get_nowait()
+            except queue.Empty:
+                return
+            token = None
             try:
                 logger.debug('trying to get token (temp) for tenant %s and user %s ', key[0], key[1])
                 token = get_token_from_az_login(profile, key[0])
-                credentials = BasicAuthentication('', token)
-
-                if skipValidateToken is True:
-                    return token
-                if validate_token_for_instance(organization, credentials):
-                    return token
-                logger.debug('invalid token obtained for tenant %s', key[0])
-            except BaseException as ex2:  # pylint: disable=broad-except
-                logger.debug(ex2)
+                if not token or found.is_set() or\
+                        not validate_token_for_instance(organization, BasicAuthentication('', token)):
+                    logger.debug('invalid token obtained for tenant %s', key[0])
+                    token = None
+            except BaseException as ex:  # pylint: disable=broad-except
+                logger.debug(ex)
                 logger.debug('failed while trying to get token for tenant %s', key[0])
-    except BaseException as ex:  # pylint: disable=broad-except
-        logger.debug(ex)
-
-    return ''
+                token = None
+            results.put((key, token))
+
+    for _ in range(min(_MAX_CONCURRENT_TENANT_PROBES, len(tenant_keys))):
+        worker = threading.Thread(target=probe, name='tenant-probe')
+        worker.daemon = True
+        worker.start()
+    for _ in tenant_keys:
+        key, token = results.get()
+        if token:
+            found.set()
+            return key, token
+    return None, None
+
+
+def _get_cached_tenant(organization):
+    cached = _tenant_cache.get(organization)
+    if not cached:
+        return None
+    return cached.get('tenantId'), cached.get('user')
+
+
+def forget_cached_tenants(organizations=None):
+    """Removes the cached az login tenant of the given organizations.
+    Defaults to every organization that authenticated with a cached tenant in this process.
+    """
+    if organizations is None:
+        organizations = list(_organizations_using_cached_tenant)
+    for organization in organizations:
+        logger.debug('removing cached tenant for organization %s', organization)
+        _organizations_using_cached_tenant.discard(organization)
+        del _tenant_cache[organization]
 
 
 def get_token_from_az_login(profile, tenant):
@@ -166,8 +245,13 @@ def get_token_from_az_login(profile, tenant):
 
 
 def _get_connection(organization, credentials):
-    return Connection(get_base_url(organization), creds=credentials,
-                      user_agent='devOpsCli/{}'.format(VERSION))
+    connection = Connection(get_base_url(organization), creds=credentials,
+                            user_agent='devOpsCli/{}'.format(VERSION))
+    # each CLI invocation is one short lived process, so repeated GETs within it can be served from memory
+    connection.enable_request_cache()
+    # unchanged resources are revalidated with ETag / Last-Modified instead of being downloaded again
+    connection.enable_http_cache(os.path.join(DEFAULT_CACHE_DIR, 'http'))
+    return connection
 
 
 def get_first_vss_instance_uri():
@@ -415,17 +499,56 @@ def get_connection_data(organization):
     organization = organization.lower()
     if organization in _connection_data:
         return _connection_data[organization]
+    cache_key = _get_connection_data_cache_key(organization)
+    if cache_key is not None and _connection_data_cache[cache_key]:
+        from msrest.exceptions import DeserializationError
+        from azext_devops.devops_sdk.v5_0.location import models
+        try:
+            logger.debug('File cache hit for connection data on: %s', organization)
+            deserialize = get_model_serializers(models)[1]
+            _connection_data[organization] = deserialize.deserialize_data(_connection_data_cache[cache_key],
+                                                                          'ConnectionData')
+            return _connection_data[organization]
+        except DeserializationError as ex:
+            logger.debug(ex, exc_info=True)
     location_client = get_location_client(organization)
     _connection_data[organization] = location_client.get_connection_data()
+    if cache_key is not None:
+        from msrest.exceptions import SerializationError
+        from azext_devops.devops_sdk.v5_0.location import models
+        try:
+            serialize = get_model_serializers(models)[0]
+            _connection_data_cache[cache_key] = serialize.serialize_data(_connection_data[organization],
+                                                                         'ConnectionData')
+        except SerializationError as ex:
+            logger.debug(ex, exc_info=True)
     return _connection_data[organization]
 
 
+def _get_connection_data_cache_key(organization):
+    """Connection data describes the authenticated user, so it is cached per organization and credential.
+    Returns None if the credential cannot be identified.
+    """
+    fingerprint = get_credential_fingerprint(get_connection(organization).credentials)
+    if fingerprint is None:
+        return None
+    return organization + '|' + fingerprint
+
+
+def get_model_serializers(models):
+    """Returns the (Serializer, Deserializer) pair for a module of SDK models, shared with the SDK clients.
+    """
+    from azext_devops.devops_sdk.client import Client
+    return Client._get_model_registry(models)  # pylint: disable=protected-access
+
+
 def get_authentication_error(message):
     return CLIError(str(message) + "  Please see https://aka.ms/azure-devops-cli-auth for more information.")
 
 
 def clear_connection_cache():
     _connection.clear()
+    _credentials.clear()
 
 
 def get_project_id_from_name(organization, project):
@@ -444,4 +567,11 @@ def check_organization_in_azure(organization):
 
 _connection_data = {}
 _connection = OrderedDict()
+_credentials = {}
+# organization and credential fingerprint -> serialized connection data, including the authenticated user
+_connection_data_cache = get_cli_cache('connection_data', 3600 * 12)
+# organization -> az login tenant and user whose token was last validated against it
+_tenant_cache = get_cli_cache('organization_tenants', 3600 * 24 * 7)
+_organizations_using_cached_tenant = set()
+_MAX_CONCURRENT_TENANT_PROBES = 8
 VSTS_MODULE = 'azext_devops.devops_sdk.'
@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import re
+
+from six.moves.urllib.parse import unquote  # pylint: disable=import-error
 from msrest.serialization import Model
 from knack.log import get_logger
 
@@ -26,6 +29,7 @@ class VstsGitUrlInfo():
             logger.debug("Remote url: %s", remote_url)
             models = {'_RemoteInfo': self._RemoteInfo}
 
+            parsed_info = self.parse_remote_url(remote_url)
             remote_url = remote_url.lower()
             remote_info = None
             if _git_remote_info_cache[remote_url]:
@@ -38,6 +42,13 @@ class VstsGitUrlInfo():
                     self.project = remote_info.project
                     self.repo = remote_info.repository
                     self.uri = remote_info.server_url
+            if remote_info is None and parsed_info is not None:
+                # names work wherever ids do; commands that need ids resolve them when they run
+                logger.debug('Resolved remote url without a server call: %s', remote_url)
+                remote_info = parsed_info
+                self.project = parsed_info.project
+                self.repo = parsed_info.repository
+                self.uri = parsed_info.server_url
             if remote_info is None:
                 vsts_info = self.get_vsts_info(remote_url)
                 if vsts_info is not None:
@@ -102,6 +113,23 @@ class VstsGitUrlInfo():
             from six import reraise
             reraise(*sys.exc_info())
 
+    @staticmethod
+    def parse_remote_url(remote_url):
+        """Gets the organization url and the project and repository names from a canonical Azure DevOps Services
+        remote url, without calling the server. Returns None for any other url.
+        :rtype: :class:`<_RemoteInfo> <azext_devops.dev.common.vsts_git_url_info.VstsGitUrlInfo._RemoteInfo>`
+        """
+        for pattern, server_url_format in _REMOTE_URL_PATTERNS:
+            match = pattern.match(remote_url.strip())
+            if match is not None:
+                values = {name: unquote(value) for name, value in match.groupdict().items() if value is not None}
+                if '/' in values['repo'] or values['repo'].startswith('_'):
+                    # e.g. _git/_full/repo or _git/_optimized/repo
+                    return None
+                project = values.get('project') or values['repo']
+                return VstsGitUrlInfo._RemoteInfo(project, values['repo'], server_url_format.format(**values))
+        return None
+
     @staticmethod
     def convert_ssh_netloc_to_https_netloc(netloc):
         if netloc is None:
@@ -112,7 +140,6 @@ class VstsGitUrlInfo():
                            latest updates: https://github.com/Microsoft/azure-devops-cli-extension/issues/142')
             return None
         # hosted url
-        import re
         regex = re.compile(r'([^@]+)@[^\.]+(\.[^:]+)')
         match = regex.match(netloc)
         if match is not None:
@@ -152,3 +179,23 @@ class VstsGitUrlInfo():
 
 
 _git_remote_info_cache = get_cli_cache('remotes', 0)
+
+# (pattern, organization url format) of the remote urls Azure DevOps Services hands out for cloning
+_REMOTE_URL_PATTERNS = [
+    # https://dev.azure.com/org/project/_git/repo, https://org@dev.azure.com/org/_git/repo
+    (re.compile(r'^https://(?:[^@/]+@)?dev\.azure\.com/(?P<org>[^/]+)/(?:(?P<project>[^/_][^/]*)/)?_git/'
+                r'(?P<repo>[^?#]+?)/?$', re.IGNORECASE),
+     'https://dev.azure.com/{org}'),
+    # https://org.visualstudio.com/project/_git/repo
+    (re.compile(r'^https://(?:[^@/]+@)?(?P<org>[a-z0-9][a-z0-9-]*)\.visualstudio\.com/(?:(?P<project>[^/_][^/]*)/)?'
+                r'_git/(?P<repo>[^?#]+?)/?$', re.IGNORECASE),
+     'https://{org}.visualstudio.com'),
+    # git@ssh.dev.azure.com:v3/org/project/repo
+    (re.compile(r'^(?:ssh://)?git@ssh\.dev\.azure\.com(?::22)?[:/]v3/(?P<org>[^/]+)/(?P<project>[^/]+)/'
+                r'(?P<repo>[^/]+?)/?$', re.IGNORECASE),
+     'https://dev.azure.com/{org}'),
+    # org@vs-ssh.visualstudio.com:v3/org/project/repo
+    (re.compile(r'^(?:ssh://)?[^@/]+@vs-ssh\.visualstudio\.com(?::22)?[:/]v3/(?P<org>[^/]+)/(?P<project>[^/]+)/'
+                r'(?P<repo>[^/]+?)/?$', re.IGNORECASE),
+     'https://{org}.visualstudio.com'),
+]
@@ -18,6 +18,7 @@ from azext_devops.devops_sdk.v6_0.pipelines.models import (RunPipelineParameters
                                                            RunResourcesParameters,
                                                            RepositoryResourceParameters)
 from .build_definition import get_definition_id_from_name, fix_path_for_api
+from .pipeline_utils import list_with_top
 from .pipeline_run import _open_pipeline_run, _open_pipeline_run6_0
 
 logger = get_logger(__name__)
@@ -55,9 +56,9 @@ def pipeline_list(name=None, top=None, organization=None, project=None, reposito
             raise ValueError("Could not find a repository with name '{}', in project '{}'."
                              .format(repository, project))
     folder_path = fix_path_for_api(folder_path)
-    definition_references = client.get_definitions(project=project, name=name, repository_id=repository,
-                                                   repository_type=repository_type, top=top, path=folder_path,
-                                                   query_order=query_order)
+    definition_references = list_with_top(client, client.get_definitions, top, project=project, name=name,
+                                          repository_id=repository, repository_type=repository_type,
+                                          path=folder_path, query_order=query_order)
     return definition_references
 
 
@@ -164,6 +164,7 @@ def poll_connection_ready(organization, project, connection_id):
         while True:
             spinner.step()
             time.sleep(0.5)
+            se_client.clear_request_cache()
             service_endpoint = se_client.get_service_endpoint_details(project, connection_id)
             if service_endpoint.is_ready:
                 break
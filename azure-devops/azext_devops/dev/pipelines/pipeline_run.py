@@ -7,6 +7,7 @@ from knack.log import get_logger
 from azext_devops.dev.common.services import resolve_instance_and_project, get_build_client
 from azext_devops.dev.common.git import resolve_git_ref_heads
 from azext_devops.dev.common.identities import resolve_identity_as_id
+from .pipeline_utils import list_with_top
 
 logger = get_logger(__name__)
 
@@ -63,16 +64,16 @@ def pipeline_run_list(pipeline_ids=None, branch=None, organization=None, project
     if tags is not None and tags:
         tags = list(set(tags))  # make distinct
     query_order = _resolve_runs_query_order(query_order)
-    builds = client.get_builds(definitions=pipeline_ids,
-                               project=project,
-                               branch_name=resolve_git_ref_heads(branch),
-                               top=top,
-                               result_filter=result,
-                               status_filter=status,
-                               reason_filter=reason,
-                               tag_filters=tags,
-                               query_order=query_order,
-                               requested_for=resolve_identity_as_id(requested_for, organization))
+    builds = list_with_top(client, client.get_builds, top,
+                           definitions=pipeline_ids,
+                           project=project,
+                           branch_name=resolve_git_ref_heads(branch),
+                           result_filter=result,
+                           status_filter=status,
+                           reason_filter=reason,
+                           tag_filters=tags,
+                           query_order=query_order,
+                           requested_for=resolve_identity_as_id(requested_for, organization))
     return builds
 
 
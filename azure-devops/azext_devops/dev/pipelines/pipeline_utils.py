@@ -34,3 +34,14 @@ def get_authorize_resource(res_id, res_type, organization, project):
     if resource:
         return resource[0].authorized
     return None
+
+
+def list_with_top(client, list_method, top, **kwargs):
+    """
+    param top: Value of a --top argument, None when not supplied
+    Returns the first page the service returns when top is None, otherwise keeps requesting
+    pages until top items are listed or there are no more pages
+    """
+    if top is None:
+        return list_method(top=top, **kwargs)
+    return list(client.get_paged_iterator(list_method, max_items=int(top), top=top, **kwargs))
@@ -7,6 +7,7 @@ from knack.log import get_logger
 from knack.util import CLIError
 from azext_devops.dev.common.services import get_task_agent_client, resolve_instance_and_project
 from azext_devops.dev.pipelines.pipeline_variables import _case_insensitive_get, _get_value_from_env_or_stdin
+from azext_devops.dev.pipelines.pipeline_utils import list_with_top
 
 logger = get_logger(__name__)
 
@@ -99,8 +100,9 @@ def variable_group_list(group_name=None, action_filter=None, top=None, continuat
     _QUERY_ORDER_DESCENDING = 'idDescending'
     query_order = _QUERY_ORDER_DESCENDING if query_order.lower() == 'desc' else _QUERY_ORDER_ASCENDING
     client = get_task_agent_client(organization)
-    return client.get_variable_groups(project=project, group_name=group_name, action_filter=action_filter, top=top,
-                                      continuation_token=continuation_token, query_order=query_order)
+    return list_with_top(client, client.get_variable_groups, top, continuation_token=continuation_token,
+                         project=project, group_name=group_name, action_filter=action_filter,
+                         query_order=query_order)
 
 
 def variable_group_delete(group_id, organization=None, project=None, detect=None):
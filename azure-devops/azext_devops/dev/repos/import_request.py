@@ -86,6 +86,7 @@ def _wait_for_import_request(client, project, repository, import_request_id, int
     import_request = client.get_import_request(project, repository, import_request_id)
     while not _has_import_request_completed(import_request):
         time.sleep(interval_seconds)
+        client.clear_request_cache()
         import_request = client.get_import_request(project, repository, import_request_id)
     return import_request
 
@@ -12,7 +12,7 @@ from azext_devops.devops_sdk.v5_0.policy.models import PolicyConfiguration
 
 from azext_devops.dev.common.git import resolve_git_ref_heads
 from azext_devops.dev.common.services import (get_policy_client, resolve_instance_and_project)
-from azext_devops.dev.common.identities import resolve_identity_as_id
+from azext_devops.dev.common.identities import resolve_identities_as_ids
 
 logger = get_logger(__name__)
 
@@ -674,12 +674,9 @@ def resolveIdentityMailsToIds(mailList, organization):
     if not mailList or (not mailList.strip()):
         return None
 
-    idList = []
-    for mail in mailList.split(';'):
-        mailStripped = mail.strip()
-        logger.debug('trying to resolve %s', mailStripped)
-        identityId = resolve_identity_as_id(mailStripped, organization)
-        logger.debug('got id as %s', identityId)
-        idList.append(identityId)
+    mails = [mail.strip() for mail in mailList.split(';')]
+    logger.debug('trying to resolve %s', mails)
+    idList = resolve_identities_as_ids(mails, organization)
+    logger.debug('got ids as %s', idList)
 
     return idList
@@ -14,7 +14,7 @@ from azext_devops.devops_sdk.v5_0.git.models import (GitPullRequest, GitPullRequ
 from azext_devops.devops_sdk.v5_0.work_item_tracking.models import JsonPatchOperation, WorkItemRelation
 from azext_devops.dev.common.arguments import should_detect
 from azext_devops.dev.common.git import get_current_branch_name, resolve_git_ref_heads, fetch_remote_and_checkout
-from azext_devops.dev.common.identities import ME, resolve_identity_as_id
+from azext_devops.dev.common.identities import ME, resolve_identity_as_id, resolve_identities_as_ids
 from azext_devops.dev.common.uri import uri_quote
 from azext_devops.dev.common.uuid import EMPTY_UUID
 from azext_devops.dev.common.services import (get_git_client,
@@ -647,12 +647,15 @@ def _resolve_reviewers_as_refs(optional_reviewers, required_reviewers, organizat
     if required_reviewers is None:
         required_reviewers = []
     resolved_reviewers = []
+    resolved_ids = resolve_identities_as_ids(list(optional_reviewers) + list(required_reviewers), organization)
+    optional_reviewer_ids = resolved_ids[:len(optional_reviewers)]
+    required_reviewer_ids = resolved_ids[len(optional_reviewers):]
 
-    for reviewer in optional_reviewers:
-        resolved_reviewers.append(IdentityRefWithVote(id=resolve_identity_as_id(reviewer, organization)))
+    for reviewer_id in optional_reviewer_ids:
+        resolved_reviewers.append(IdentityRefWithVote(id=reviewer_id))
 
-    for reviewer in required_reviewers:
-        resolved_reviewer = IdentityRefWithVote(id=resolve_identity_as_id(reviewer, organization))
+    for reviewer_id in required_reviewer_ids:
+        resolved_reviewer = IdentityRefWithVote(id=reviewer_id)
 
         # is this id already in the list (make duplicate required)
         for optional_reviewer in resolved_reviewers:
@@ -672,9 +675,7 @@ def _resolve_reviewers_as_ids(reviewers, organization):
     """
     resolved_reviewers = None
     if reviewers is not None and reviewers:
-        resolved_reviewers = []
-        for reviewer in reviewers:
-            resolved_reviewers.append(resolve_identity_as_id(reviewer, organization))
+        resolved_reviewers = resolve_identities_as_ids(reviewers, organization)
     return resolved_reviewers
 
 
@@ -58,7 +58,7 @@ def invoke(area=None, resource=None,
         for x in service_list:
             try:
                 logger.info('trying to get locations from %s', x)
-                clientMock = Client(x, connection._creds)
+                clientMock = Client(x, connection.credentials)
                 resource_location_on_this_service = clientMock._get_resource_locations(all_host_types=True)
                 resource_locations.extend(resource_location_on_this_service)
             except:  # pylint: disable=bare-except
@@ -78,7 +78,7 @@ def invoke(area=None, resource=None,
     if not client_url:
         raise CLIError('--area is not present in current organization')
 
-    client = Client(client_url, connection._creds)
+    client = Client(client_url, connection.credentials)
 
     # there can be multiple resource/ area with different version so this version comparision is needed
     location_id = ''
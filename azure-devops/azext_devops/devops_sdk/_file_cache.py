@@ -7,6 +7,8 @@ import base64
 import json
 import logging
 import os
+import sqlite3
+import threading
 import time
 try:
     import collections.abc as collections
@@ -16,98 +18,281 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_AGE = 3600 * 12  # 12 hours
+DEFAULT_STALE_MAX_AGE = 3600 * 24 * 7  # 7 days
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024  # 20 MB
+
+# last access times are only written back when older than this, so reads rarely need a write lock
+_ACCESS_TIME_RESOLUTION = 60
+
 
 class FileCache(collections.MutableMapping):
-    """A simple dict-like class that is backed by a JSON file.
+    """A dict-like class that is backed by a SQLite database file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    Every assignment or deletion updates only the affected entry. SQLite's journal makes each update
+    atomic and its file locks keep concurrent CLI processes from clobbering each other's writes.
+    Entries expire individually max_age seconds after they were written, and once the cache holds
+    more than max_entries entries or max_bytes of data the least recently used entries are evicted.
+
+    Direct modifications are saved immediately. Indirect modifications (to a value returned by
+    `cache[key]`) should be followed by a call to `save_with_retry` or `save`.
     """
 
-    def __init__(self, file_name, max_age=0):
+    def __init__(self, file_name, max_age=0, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
         super(FileCache, self).__init__()
         self.file_name = file_name
         self.max_age = max_age
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         self.data = {}
         self.initial_load_occurred = False
+        self._updated = {}
+        # key -> the JSON last read from or written to the database, to tell which values were modified in place
+        self._saved = {}
+        self._db = None
+        self._lock = threading.RLock()
 
     def load(self):
-        self.data = {}
-        try:
-            if os.path.isfile(self.file_name):
-                if self.max_age > 0 and os.stat(self.file_name).st_mtime + self.max_age < time.time():
-                    logger.debug('Cache file expired: %s', self.file_name)
-                    os.remove(self.file_name)
-                else:
-                    logger.debug('Loading cache file: %s', self.file_name)
-                    self.data = get_file_json(self.file_name, throw_on_empty=False) or {}
-            else:
-                logger.debug('Cache file does not exist: %s', self.file_name)
-        except Exception as ex:
-            logger.debug(ex, exc_info=True)
-            # file is missing or corrupt so attempt to delete it
+        with self._lock:
+            self.data = {}
+            self._updated = {}
+            self._saved = {}
+            self._close()
             try:
-                os.remove(self.file_name)
-            except Exception as ex2:
-                logger.debug(ex2, exc_info=True)
-        self.initial_load_occurred = True
+                self._db = self._open()
+                self._import_json_file()
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug(ex, exc_info=True)
+                # file is corrupt so attempt to delete it and start over
+                self._close()
+                self._remove_file()
+                try:
+                    self._db = self._open()
+                except Exception as ex2:  # pylint: disable=broad-except
+                    logger.debug(ex2, exc_info=True)
+                    self._db = None
+            self.initial_load_occurred = True
 
     def save(self):
+        """Writes back the entries whose values were modified since they were read or set.
+        Unmodified entries are left alone, so reading an entry does not extend its lifetime.
+        """
         self._check_for_initial_load()
-        self._save()
-
-    def _save(self):
-        if self.file_name:
-            with os.fdopen(os.open(self.file_name, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600), 'w+') as cred_file:
-                cred_file.write(json.dumps(self.data))
+        for key, value in list(self.data.items()):
+            if json.dumps(value) != self._saved.get(key):
+                self.set(key, value)
 
     def save_with_retry(self, retries=5):
-        self._check_for_initial_load()
-        for _ in range(retries - 1):
-            try:
-                self.save()
-                break
-            except OSError:
-                time.sleep(0.1)
-        else:
-            self.save()
+        # SQLite already waits for locks held by other processes, see _open
+        self.save()
 
     def clear(self):
-        if os.path.isfile(self.file_name):
-            logger.info("Deleting file: " + self.file_name)
-            os.remove(self.file_name)
-        else:
-            logger.info("File does not exist: " + self.file_name)
+        with self._lock:
+            self._close()
+            self.data = {}
+            self._saved = {}
+            self.initial_load_occurred = False
+            if os.path.isfile(self.file_name):
+                logger.info("Deleting file: " + self.file_name)
+                self._remove_file()
+            else:
+                logger.info("File does not exist: " + self.file_name)
 
     def get(self, key, default=None):
         self._check_for_initial_load()
-        return self.data.get(key, default)
+        if key in self.data:
+            return self.data[key]
+        value, updated, serialized = self._read(key)
+        if value is None:
+            return default
+        self.data[key] = value
+        self._updated[key] = updated
+        self._saved[key] = serialized
+        return value
+
+    def is_stale(self, key, max_age=DEFAULT_MAX_AGE):
+        """Returns True when the entry for key was written more than max_age seconds ago.
+        Stale entries can still be served while they are refreshed, see refresh_in_background.
+        """
+        if self.get(key) is None:
+            return False
+        updated = self._updated.get(key)
+        return updated is not None and updated + max_age < time.time()
+
+    def set(self, key, value, max_age=None):
+        """Stores value for key. It expires after max_age seconds, which defaults to the max_age of the cache.
+        """
+        self._check_for_initial_load()
+        self.data[key] = value
+        if max_age is None:
+            max_age = self.max_age
+        now = time.time()
+        self._updated[key] = now
+        serialized = json.dumps(value)
+        self._saved[key] = serialized
+
+        def write(db):
+            self._write_entry(db, key, serialized, now, max_age)
+            self._evict(db, now)
+        self._execute_write(write)
 
     def __getitem__(self, key):
-        self._check_for_initial_load()
-        return self.data.setdefault(key, {})
+        value = self.get(key)
+        if value is None:
+            self._saved.setdefault(key, json.dumps({}))
+            return self.data.setdefault(key, {})
+        return value
 
     def __setitem__(self, key, value):
-        self._check_for_initial_load()
-        self.data[key] = value
-        self.save_with_retry()
+        self.set(key, value)
 
     def __delitem__(self, key):
         self._check_for_initial_load()
-        del self.data[key]
-        self.save_with_retry()
+        self.data.pop(key, None)
+        self._updated.pop(key, None)
+        self._saved.pop(key, None)
+        self._execute_write(lambda db: db.execute('DELETE FROM entries WHERE key = ?', (key,)))
 
     def __iter__(self):
         self._check_for_initial_load()
-        return iter(self.data)
+        return iter(self._keys())
 
     def __len__(self):
         self._check_for_initial_load()
-        return len(self.data)
+        return len(self._keys())
 
     def _check_for_initial_load(self):
         if not self.initial_load_occurred:
-            self.load()
+            with self._lock:
+                if not self.initial_load_occurred:
+                    self.load()
+
+    def _open(self):
+        directory = os.path.dirname(self.file_name)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        if not os.path.isfile(self.file_name):
+            # create the file up front so it is only readable by the current user
+            os.close(os.open(self.file_name, os.O_RDWR | os.O_CREAT, 0o600))
+        logger.debug('Opening cache file: %s', self.file_name)
+        db = sqlite3.connect(self.file_name, timeout=10, check_same_thread=False, isolation_level=None)
+        db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                   'updated REAL NOT NULL, expires REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)')
+        return db
+
+    def _close(self):
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error as ex:
+                logger.debug(ex, exc_info=True)
+            self._db = None
+
+    def _remove_file(self):
+        for file_name in (self.file_name, self.file_name + '-journal'):
+            try:
+                if os.path.isfile(file_name):
+                    os.remove(file_name)
+            except OSError as ex:
+                logger.debug(ex, exc_info=True)
+
+    def _import_json_file(self):
+        """Moves the entries of the JSON file used by earlier versions of this cache into the database."""
+        json_file_name = os.path.splitext(self.file_name)[0] + '.json'
+        if json_file_name == self.file_name or not os.path.isfile(json_file_name):
+            return
+        try:
+            if self.max_age <= 0 or os.stat(json_file_name).st_mtime + self.max_age >= time.time():
+                logger.debug('Importing cache file: %s', json_file_name)
+                data = get_file_json(json_file_name, throw_on_empty=False) or {}
+                now = time.time()
+
+                def import_entries(db):
+                    for key, value in data.items():
+                        self._write_entry(db, key, json.dumps(value), now, self.max_age)
+                    self._evict(db, now)
+                self._execute_write(import_entries)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug(ex, exc_info=True)
+        try:
+            os.remove(json_file_name)
+        except OSError as ex:
+            logger.debug(ex, exc_info=True)
+
+    def _read(self, key):
+        with self._lock:
+            if self._db is None:
+                return None, None, None
+            try:
+                row = self._db.execute('SELECT value, updated, expires, accessed FROM entries WHERE key = ?',
+                                       (key,)).fetchone()
+                if row is None:
+                    return None, None, None
+                value, updated, expires, accessed = row
+                now = time.time()
+                if 0 < expires < now:
+                    logger.debug('Cache entry expired: %s', key)
+                    self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                    return None, None, None
+                if now - accessed > _ACCESS_TIME_RESOLUTION:
+                    self._db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+                return json.loads(value), updated, value
+            except (sqlite3.Error, ValueError) as ex:
+                logger.debug(ex, exc_info=True)
+                return None, None, None
+
+    def _keys(self):
+        with self._lock:
+            if self._db is None:
+                return list(self.data)
+            try:
+                rows = self._db.execute('SELECT key FROM entries WHERE expires = 0 OR expires >= ?',
+                                        (time.time(),)).fetchall()
+            except sqlite3.Error as ex:
+                logger.debug(ex, exc_info=True)
+                return list(self.data)
+        keys = [row[0] for row in rows]
+        stored_keys = set(keys)
+        return keys + [key for key in self.data if key not in stored_keys]
+
+    def _execute_write(self, write):
+        with self._lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute('BEGIN IMMEDIATE')
+                try:
+                    write(self._db)
+                    self._db.execute('COMMIT')
+                except Exception:
+                    self._db.execute('ROLLBACK')
+                    raise
+            except sqlite3.Error as ex:
+                logger.debug(ex, exc_info=True)
+
+    def _write_entry(self, db, key, serialized, now, max_age):
+        expires = now + max_age if max_age > 0 else 0
+        db.execute('INSERT OR REPLACE INTO entries (key, value, updated, expires, accessed, size) '
+                   'VALUES (?, ?, ?, ?, ?, ?)', (key, serialized, now, expires, now, len(serialized)))
+
+    def _evict(self, db, now):
+        db.execute('DELETE FROM entries WHERE expires > 0 AND expires < ?', (now,))
+        count, total_size = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in db.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            evicted.append(key)
+            count -= 1
+            total_size -= size
+        logger.debug('Evicting %s least recently used entries from cache file: %s', len(evicted), self.file_name)
+        db.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key in evicted])
+        for key in evicted:
+            self.data.pop(key, None)
+            self._saved.pop(key, None)
 
 
 def get_cache_dir():
@@ -118,17 +303,51 @@ def get_cache_dir():
     return azure_devops_cache_dir
 
 
-DEFAULT_MAX_AGE = 3600 * 12  # 12 hours
 DEFAULT_CACHE_DIR = get_cache_dir()
 
 
-def get_cache(name, max_age=DEFAULT_MAX_AGE, cache_dir=DEFAULT_CACHE_DIR):
-    file_name = os.path.join(cache_dir, name + '.json')
-    return FileCache(file_name, max_age)
+def get_cache(name, max_age=DEFAULT_MAX_AGE, cache_dir=DEFAULT_CACHE_DIR,
+              max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+    file_name = os.path.join(cache_dir, name + '.db')
+    return FileCache(file_name, max_age, max_entries=max_entries, max_bytes=max_bytes)
+
+
+def refresh_in_background(cache, key, fetch):
+    """Replaces the entry for key with the result of fetch(), called on a background thread.
+    Only one refresh per entry runs at a time. The thread is a daemon, so a refresh that has not finished
+    when the process exits is dropped and the stale entry is refreshed by a later process instead.
+    """
+    refresh_key = (cache.file_name, key)
+    with _refreshes_lock:
+        if refresh_key in _refreshes:
+            return None
+        _refreshes.add(refresh_key)
+
+    def refresh():
+        try:
+            value = fetch()
+            if value is not None:
+                cache[key] = value
+                logger.debug('Refreshed stale cache entry %s in: %s', key, cache.file_name)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug(ex, exc_info=True)
+        finally:
+            with _refreshes_lock:
+                _refreshes.discard(refresh_key)
+
+    thread = threading.Thread(target=refresh, name='cache-refresh')
+    thread.daemon = True
+    thread.start()
+    return thread
+
 
+_refreshes = set()
+_refreshes_lock = threading.Lock()
 
-OPTIONS_CACHE = get_cache('options')
-RESOURCE_CACHE = get_cache('resources')
+# Options and resource areas rarely change. Entries are refreshed in the background once they are older than
+# DEFAULT_MAX_AGE, and only dropped (forcing a blocking call) after DEFAULT_STALE_MAX_AGE.
+OPTIONS_CACHE = get_cache('options', max_age=DEFAULT_STALE_MAX_AGE)
+RESOURCE_CACHE = get_cache('resources', max_age=DEFAULT_STALE_MAX_AGE)
 
 
 # Code below this point from azure-cli-core
@@ -0,0 +1,194 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024  # 50 MB
+# eviction frees some room below max_size, so the directory is not listed again on the next store
+_EVICT_TO_RATIO = 0.9
+
+
+class HttpCache(object):
+    """Disk cache of JSON GET responses that carry an ETag or Last-Modified validator.
+
+    Entries are never served without asking the server: the stored validators are sent as
+    If-None-Match / If-Modified-Since and the stored body is only used when the server answers
+    304 Not Modified. Each entry is one file; its modification time is bumped on every hit so the
+    least recently used entries are evicted first once the directory grows past max_size bytes.
+    The directory is only listed on the first store and when the running size crosses max_size.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        # bytes in the directory as of the last listing plus what was written since, None until listed
+        self._size = None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the cached entry for key, or None.
+        :param str key: Identifies the request, e.g. its url, Accept header and credentials.
+        :rtype: :class:`<HttpCacheEntry> <azext_devops.devops_sdk._http_cache.HttpCacheEntry>`
+        """
+        file_name = self._get_file_name(key)
+        try:
+            with open(file_name, 'r') as entry_file:
+                data = json.load(entry_file)
+        except (IOError, OSError):
+            return None
+        except ValueError as ex:
+            logger.debug('Removing corrupt http cache entry %s: %s', file_name, ex)
+            self._remove(file_name)
+            return None
+        if data.get('key') != key:
+            return None
+        self._touch(file_name)
+        return HttpCacheEntry(etag=data.get('etag'),
+                              last_modified=data.get('last_modified'),
+                              content_type=data.get('content_type'),
+                              body=data.get('body'))
+
+    def add_validators(self, entry, headers):
+        """Adds the conditional request headers for entry to headers.
+        :param HttpCacheEntry entry:
+        :param dict headers:
+        """
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+
+    def restore_response(self, entry, response):
+        """Turns a 304 Not Modified response into a 200 response carrying the cached body.
+        :param HttpCacheEntry entry:
+        :param response: The requests.Response returned by the server.
+        """
+        self.hits += 1
+        response.status_code = 200
+        response._content = entry.body.encode('utf-8')  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.headers['Content-Type'] = entry.content_type
+        response.headers.pop('Transfer-Encoding', None)
+        return response
+
+    def store(self, key, response):
+        """Stores the body of a successful JSON response, if the server sent a validator for it.
+        :param str key: Identifies the request, e.g. its url, Accept header and credentials.
+        :param response: The requests.Response returned by the server.
+        """
+        if response.status_code != 200:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        content_type = response.headers.get('Content-Type', '')
+        if not (etag or last_modified) or not content_type.startswith('application/json'):
+            return
+        try:
+            body = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            return
+        data = json.dumps({'key': key,
+                           'etag': etag,
+                           'last_modified': last_modified,
+                           'content_type': content_type,
+                           'body': body})
+        if len(data) > self.max_size // 10:
+            # one large response should not flush the rest of the cache
+            logger.debug('Response too large for the http cache: %s', key)
+            return
+        file_name = self._get_file_name(key)
+        try:
+            replaced_size = os.path.getsize(file_name) if os.path.isfile(file_name) else 0
+            self._write(file_name, data)
+        except (IOError, OSError) as ex:
+            logger.debug(ex, exc_info=True)
+            return
+        self._update_size(len(data) - replaced_size)
+
+    def clear(self):
+        with self._lock:
+            for file_name in self._list_files():
+                self._remove(file_name)
+            self._size = None
+
+    def _write(self, file_name, data):
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        # write to a temporary file first so concurrent readers never see a partial entry
+        temp_file_name = '{}.{}.tmp'.format(file_name, uuid.uuid4().hex)
+        with os.fdopen(os.open(temp_file_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as entry_file:
+            entry_file.write(data)
+        os.replace(temp_file_name, file_name)
+
+    def _update_size(self, written_size):
+        with self._lock:
+            if self._size is not None:
+                self._size += written_size
+                if self._size <= self.max_size:
+                    return
+            # other processes may share the directory, so list it to get the actual size before evicting
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for file_name in self._list_files():
+            try:
+                stat = os.stat(file_name)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, file_name))
+            total_size += stat.st_size
+        if total_size > self.max_size:
+            target_size = self.max_size * _EVICT_TO_RATIO
+            entries.sort()
+            for _, size, file_name in entries:
+                if total_size <= target_size:
+                    break
+                logger.debug('Evicting http cache entry: %s', file_name)
+                self._remove(file_name)
+                total_size -= size
+        self._size = total_size
+
+    def _list_files(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        return [os.path.join(self.cache_dir, name) for name in names if name.endswith('.json')]
+
+    def _get_file_name(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    @staticmethod
+    def _touch(file_name):
+        try:
+            os.utime(file_name, None)
+        except OSError as ex:
+            logger.debug(ex, exc_info=True)
+
+    @staticmethod
+    def _remove(file_name):
+        try:
+            os.remove(file_name)
+        except OSError as ex:
+            logger.debug(ex, exc_info=True)
+
+
+class HttpCacheEntry(object):
+    def __init__(self, etag=None, last_modified=None, content_type=None, body=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_type = content_type
+        self.body = body
@@ -0,0 +1,91 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import logging
+import threading
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class RequestCache(object):
+    """In memory cache of GET responses, meant to live for a single invocation.
+
+    Identical requests issued while the first one is still in flight wait for its response instead of
+    going to the server again. Any write clears the cache so later reads see the change. Only the most
+    recently used max_entries responses are kept.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.hits = 0
+        self.misses = 0
+        self._max_entries = max_entries
+        self._responses = OrderedDict()
+        self._in_flight = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_send(self, key, send, cacheable=None):
+        """Returns the cached response for key, or calls send() and caches what it returns.
+        Responses are shared with every caller waiting on the same key, so send() must return responses whose
+        body has already been read.
+        :param tuple key: Identifies the request, e.g. method, url and headers.
+        :param send: Callable issuing the request.
+        :param cacheable: Optional callable telling whether a response may be kept for later requests.
+        """
+        with self._lock:
+            if key in self._responses:
+                self.hits += 1
+                logger.debug('Request cache hit: %s', key[1])
+                self._responses.move_to_end(key)
+                return self._responses[key]
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                self.hits += 1
+                owner = False
+            else:
+                in_flight = self._in_flight[key] = _InFlightRequest()
+                self.misses += 1
+                owner = True
+            generation = self._generation
+        if not owner:
+            logger.debug('Waiting on identical in-flight request: %s', key[1])
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.response
+        try:
+            in_flight.response = send()
+        except Exception as ex:
+            in_flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if in_flight.error is None and generation == self._generation\
+                        and (cacheable is None or cacheable(in_flight.response)):
+                    self._responses[key] = in_flight.response
+                    while len(self._responses) > self._max_entries:
+                        self._responses.popitem(last=False)
+            in_flight.done.set()
+        return in_flight.response
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+            self._generation += 1
+
+    def __len__(self):
+        return len(self._responses)
+
+
+class _InFlightRequest(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
@@ -0,0 +1,149 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import calendar
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 1.0
+DEFAULT_MAX_BACKOFF = 60
+DEFAULT_REQUEST_RATE = 20  # requests per second
+
+RETRY_AFTER_HEADER = 'Retry-After'
+RATE_LIMIT_REMAINING_HEADER = 'X-RateLimit-Remaining'
+RATE_LIMIT_LIMIT_HEADER = 'X-RateLimit-Limit'
+RATE_LIMIT_DELAY_HEADER = 'X-RateLimit-Delay'
+
+
+class RetryPolicy(object):
+    """Decides whether a throttled request should be sent again and how long to wait first.
+
+    5xx responses are already retried by msrest, so only 429 Too Many Requests is handled here.
+    The server's Retry-After is honoured; without it the wait grows exponentially with jitter.
+    """
+
+    retry_status_codes = (429,)
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_backoff=DEFAULT_MAX_BACKOFF):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+    def get_retry_delay(self, response, attempt):
+        """Returns the seconds to wait before sending the request again, or None to give up.
+        :param response: The response to the last attempt.
+        :param int attempt: Number of retries already made.
+        :rtype: float
+        """
+        if response.status_code not in self.retry_status_codes or attempt >= self.max_retries:
+            return None
+        retry_after = get_retry_after(response.headers)
+        if retry_after is None:
+            backoff = self.backoff_factor * (2 ** attempt)
+            return min(self.max_backoff, backoff + random.uniform(0, backoff / 2))
+        if retry_after > self.max_backoff:
+            logger.debug('Retry-After of %s seconds exceeds the maximum backoff, not retrying.', retry_after)
+            return None
+        return retry_after
+
+
+class TokenBucket(object):
+    """Request scheduler shared by all clients of a connection.
+
+    Every request takes a token; tokens refill at the current rate. The rate is halved whenever the
+    server reports that the caller is close to or past its limit (X-RateLimit-Remaining,
+    X-RateLimit-Delay) and creeps back up to the configured rate while responses are unthrottled.
+    A Retry-After pauses all callers until it has passed.
+    """
+
+    low_remaining_ratio = 0.1
+
+    def __init__(self, rate=DEFAULT_REQUEST_RATE, capacity=None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._last_refill = time.time()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request may be sent.
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            logger.debug('Rate limited, waiting %.2f seconds before sending request.', wait)
+            time.sleep(wait)
+
+    def update(self, headers):
+        """Adjusts the request rate from the rate limit headers of a response.
+        :param headers: Response headers.
+        """
+        retry_after = get_retry_after(headers)
+        with self._lock:
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.time() + retry_after)
+                self._slow_down()
+            elif _is_close_to_limit(headers, self.low_remaining_ratio):
+                self._slow_down()
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + 1)
+
+    def _slow_down(self):
+        self.rate = max(1.0, self.rate / 2)
+        self._tokens = min(self._tokens, self.rate)
+        logger.debug('Server reported throttling, reducing request rate to %.1f per second.', self.rate)
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+
+def get_retry_after(headers):
+    """Returns the Retry-After header in seconds, or None when it is missing or invalid.
+    """
+    value = headers.get(RETRY_AFTER_HEADER)
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = parsedate(value)
+        if parsed is None:
+            return None
+        return max(0.0, calendar.timegm(parsed) - time.time())
+
+
+def _is_close_to_limit(headers, low_remaining_ratio):
+    delay = headers.get(RATE_LIMIT_DELAY_HEADER)
+    try:
+        if delay and float(delay) > 0:
+            return True
+    except ValueError:
+        pass
+    remaining = headers.get(RATE_LIMIT_REMAINING_HEADER)
+    limit = headers.get(RATE_LIMIT_LIMIT_HEADER)
+    if remaining is None:
+        return False
+    try:
+        if limit:
+            return float(remaining) <= float(limit) * low_remaining_ratio
+        return float(remaining) <= 0
+    except ValueError:
+        return False
@@ -0,0 +1,78 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+import functools
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncClient(object):
+    """AsyncClient.
+    Exposes the operations of a generated client (v5_0, v5_1, v6_0, ...) as coroutines, so many requests can be
+    awaited concurrently on one event loop. Requests are still built and sent by the wrapped client, so route
+    templates, api version negotiation and error handling are the same as for synchronous calls.
+    :param Client client: The client whose operations are exposed.
+    :param int max_concurrency: Maximum number of requests in flight at once.
+    :param executor: Executor to send requests on, e.g. one shared by all async clients of a connection.
+    It is owned by the caller and not shut down by close. When None, the client creates its own.
+    """
+
+    def __init__(self, client, max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None):
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1.')
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency) if executor is None else executor
+        # keyed weakly so the semaphores of closed loops do not keep them alive
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def operation(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+        return operation
+
+    async def run(self, operation, *args, **kwargs):
+        """run.
+        Awaits a synchronous client operation without blocking the event loop.
+        :param operation: Bound operation of the wrapped client, e.g. client.get_work_item.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(self._executor, functools.partial(operation, *args, **kwargs))
+
+    async def gather(self, operation, arguments_list, return_exceptions=False):
+        """gather.
+        Runs an operation once per entry of arguments_list and returns the results in the same order.
+        :param operation: Name of the client operation, e.g. 'get_work_item'.
+        :param arguments_list: List of keyword argument dicts, one per call.
+        :param bool return_exceptions: Return raised exceptions as results instead of failing on the first one.
+        :rtype: list
+        """
+        coroutine_function = getattr(self, operation)
+        return await asyncio.gather(*[coroutine_function(**arguments) for arguments in arguments_list],
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def _get_semaphore(self, loop):
+        # semaphores are bound to the loop they are first used on
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
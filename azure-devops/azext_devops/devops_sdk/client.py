@@ -8,16 +8,21 @@ from __future__ import print_function
 import logging
 import os
 import re
+import threading
+import time
 import uuid
 
 from msrest import Deserializer, Serializer
 from msrest.exceptions import DeserializationError, SerializationError
 from msrest.universal_http import ClientRequest
+from msrest.universal_http.requests import RequestsHTTPSender
 from msrest.service_client import ServiceClient
 from .exceptions import AzureDevOpsAuthenticationError, AzureDevOpsClientRequestError, AzureDevOpsServiceError
 from .client_configuration import ClientConfiguration
+from .credentials import get_credential_fingerprint
 from . import _models
-from ._file_cache import OPTIONS_CACHE as OPTIONS_FILE_CACHE
+from ._file_cache import OPTIONS_CACHE as OPTIONS_FILE_CACHE, refresh_in_background
+from ._throttling import RetryPolicy
 
 
 logger = logging.getLogger(__name__)
@@ -33,19 +38,83 @@ class Client(object):
         self.config = ClientConfiguration(base_url)
         self.config.credentials = creds
         self._client = ServiceClient(creds, config=self.config)
-        _base_client_models = {k: v for k, v in _models.__dict__.items() if isinstance(v, type)}
-        self._base_deserialize = Deserializer(_base_client_models)
-        self._base_serialize = Serializer(_base_client_models)
+        self._base_serialize, self._base_deserialize = self._get_model_registry(_models)
         self._all_host_types_locations = None
         self._locations = None
         self._suppress_fedauth_redirect = True
         self._force_msa_pass_through = True
+        self._session = None
+        self._request_cache = None
+        self._http_cache = None
+        self._retry_policy = RetryPolicy()
+        self._rate_limiter = None
+        self._response_state = threading.local()
         self.normalized_url = Client._normalize_url(base_url)
 
+    @staticmethod
+    def _get_model_registry(models_module):
+        """Returns the (Serializer, Deserializer) pair for a models module.
+        The pair is built the first time a client using the module is created and shared by all later clients.
+        :param models_module: The models module of the client, e.g. azext_devops.devops_sdk.v5_0.git.models
+        :rtype: tuple
+        """
+        registry = Client._model_registry.get(models_module.__name__)
+        if registry is None:
+            with Client._model_registry_lock:
+                registry = Client._model_registry.get(models_module.__name__)
+                if registry is None:
+                    client_models = {k: v for k, v in models_module.__dict__.items() if isinstance(v, type)}
+                    registry = (Serializer(client_models), Deserializer(client_models))
+                    Client._model_registry[models_module.__name__] = registry
+        return registry
+
     def add_user_agent(self, user_agent):
         if user_agent is not None:
             self.config.add_user_agent(user_agent)
 
+    def set_session(self, session):
+        """Use a shared requests session (and its keep-alive connection pool) for all calls from this client.
+        :param session: The requests.Session to send requests on. None reverts to a client owned session.
+        """
+        self._session = session
+        # keep msrest from closing the shared session, and with it the pool, after a non streamed response
+        self.config.keep_alive = session is not None
+        if session is None:
+            driver = RequestsHTTPSender(self.config)
+        else:
+            driver = _SharedSessionHTTPSender(session, self.config)
+        self._client.config.pipeline._sender.driver = driver  # pylint: disable=protected-access
+
+    def set_request_cache(self, request_cache):
+        """Serve repeated GET requests from a shared in memory cache. Any other request clears the cache.
+        :param RequestCache request_cache: The cache to use. None turns caching off.
+        """
+        self._request_cache = request_cache
+
+    def clear_request_cache(self):
+        """Forgets cached GET responses, e.g. before polling a resource for a status change.
+        """
+        if self._request_cache is not None:
+            self._request_cache.clear()
+
+    def set_http_cache(self, http_cache):
+        """Revalidate JSON GET responses against a disk cache using ETag / Last-Modified conditional requests.
+        :param HttpCache http_cache: The cache to use. None turns conditional requests off.
+        """
+        self._http_cache = http_cache
+
+    def set_retry_policy(self, retry_policy):
+        """Sets how throttled (429) requests are retried.
+        :param RetryPolicy retry_policy: The policy to use. None turns retries off.
+        """
+        self._retry_policy = retry_policy
+
+    def set_rate_limiter(self, rate_limiter):
+        """Schedule requests through a rate limiter, usually one shared by all clients of a connection.
+        :param TokenBucket rate_limiter: The limiter to use. None sends requests as soon as they are made.
+        """
+        self._rate_limiter = rate_limiter
+
     def _send_request(self, request, headers=None, content=None, media_type=None, **operation_config):
         """Prepare and send request object according to configuration.
         :param ClientRequest request: The request object to be sent.
@@ -59,15 +128,71 @@ class Client(object):
         logger.debug('%s %s', request.method, request.url)
         if media_type is not None and media_type == 'application/json':
             logger.debug('Request content: %s', content)
-        response = self._client.send(request=request, headers=headers,
-                                     content=content, **operation_config)
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            response = self._client.send(request=request, headers=headers,
+                                         content=content, **operation_config)
+            if self._rate_limiter is not None:
+                self._rate_limiter.update(response.headers)
+            if self._retry_policy is None or not Client._is_replayable(content):
+                break
+            delay = self._retry_policy.get_retry_delay(response, attempt)
+            if delay is None:
+                break
+            attempt += 1
+            logger.debug('Request throttled with status code %s, retry %s in %.2f seconds: %s',
+                         response.status_code, attempt, delay, request.url)
+            response.close()
+            time.sleep(delay)
         if ('Content-Type' in response.headers
                 and response.headers['Content-Type'].startswith('application/json')):
             logger.debug('Response content: %s', response.content)
+        if response.status_code == 304 and headers is not None\
+                and ('If-None-Match' in headers or 'If-Modified-Since' in headers):
+            return response
         if response.status_code < 200 or response.status_code >= 300:
             self._handle_error(request, response)
         return response
 
+    @staticmethod
+    def _is_replayable(content):
+        # streamed uploads are consumed by the first attempt and cannot be sent again
+        return content is None or isinstance(content, (dict, list, str, bytes))
+
+    def _send_get_request(self, request, headers, content=None, media_type=None):
+        """Sends a GET request, revalidating the http cache entry for it if there is one.
+        """
+        fingerprint = get_credential_fingerprint(self.config.credentials)
+        if self._http_cache is None or (fingerprint is None and self.config.credentials is not None):
+            # responses are only cached for credentials that can be told apart
+            return self._send_request(request=request, headers=headers, content=content, media_type=media_type)
+        cache_key = request.url + '|' + headers['Accept'] + '|' + (fingerprint or '')
+        entry = self._http_cache.get(cache_key)
+        if entry is not None:
+            self._http_cache.add_validators(entry, headers)
+        response = self._send_request(request=request, headers=headers, content=content, media_type=media_type)
+        if response.status_code == 304:
+            if entry is None:
+                # the caller sent its own validators, the 304 is the answer it asked for
+                return response
+            logger.debug('Not modified, using http cache entry for: %s', request.url)
+            return self._http_cache.restore_response(entry, response)
+        self._http_cache.store(cache_key, response)
+        return response
+
+    def _send_buffered_get_request(self, request, headers, content=None, media_type=None):
+        response = self._send_get_request(request=request, headers=headers, content=content, media_type=media_type)
+        # msrest streams responses, read the body now so the response can be handed to several callers
+        _ = response.content
+        return response
+
+    @staticmethod
+    def _is_json_response(response):
+        content_type = response.headers.get('Content-Type')
+        return content_type is not None and content_type.startswith('application/json')
+
     def _send(self, http_method, location_id, version, route_values=None,
               query_parameters=None, content=None, media_type='application/json', accept_media_type='application/json',
               additional_headers=None):
@@ -101,11 +226,56 @@ class Client(object):
             headers['X-VSS-ForceMsaPassThrough'] = 'true'
         if Client._session_header_key in Client._session_data and Client._session_header_key not in headers:
             headers[Client._session_header_key] = Client._session_data[Client._session_header_key]
-        response = self._send_request(request=request, headers=headers, content=content, media_type=media_type)
+        if http_method == 'GET' and self._request_cache is None:
+            response = self._send_get_request(request=request, headers=headers, content=content, media_type=media_type)
+        elif http_method == 'GET' and accept_media_type != 'application/json':
+            # downloads are streamed, their body can only be read once so they are never shared
+            response = self._send_get_request(request=request, headers=headers, content=content, media_type=media_type)
+        elif http_method == 'GET':
+            cache_key = (http_method, request.url, negotiated_version, headers['Accept'])
+            response = self._request_cache.get_or_send(
+                cache_key,
+                lambda: self._send_buffered_get_request(request=request, headers=headers, content=content,
+                                                        media_type=media_type),
+                cacheable=Client._is_json_response)
+        elif self._request_cache is None:
+            response = self._send_request(request=request, headers=headers, content=content, media_type=media_type)
+        else:
+            self._request_cache.clear()
+            response = self._send_request(request=request, headers=headers, content=content, media_type=media_type)
         if Client._session_header_key in response.headers:
             Client._session_data[Client._session_header_key] = response.headers[Client._session_header_key]
+        self._response_state.continuation_token = self._get_continuation_token(response)
         return response
 
+    def get_paged_iterator(self, list_method, max_items=None, continuation_token=None, **kwargs):
+        """Lazily iterates over every item returned by a continuation token based list method of this client.
+        The next page is only requested once the items of the current page have been consumed.
+        :param list_method: Bound list method of this client that accepts a continuation_token argument,
+            e.g. client.get_builds. Methods returning a list or a *ResponseValue wrapper are both supported.
+        :param int max_items: Stop after this many items. None iterates over all pages.
+        :param continuation_token: Token to start from. None starts from the first page.
+        :param kwargs: Arguments passed through to list_method on every page request.
+        """
+        item_count = 0
+        while True:
+            result = list_method(continuation_token=continuation_token, **kwargs)
+            if hasattr(result, 'continuation_token') and hasattr(result, 'value'):
+                page = result.value
+                next_token = result.continuation_token
+            else:
+                page = result
+                next_token = getattr(self._response_state, 'continuation_token', None)
+            for item in page or []:
+                yield item
+                item_count += 1
+                if max_items is not None and item_count >= max_items:
+                    return
+            if not next_token or next_token == continuation_token:
+                return
+            logger.debug('Requesting next page with continuation token: %s', next_token)
+            continuation_token = next_token
+
     def _unwrap_collection(self, response):
         if response.headers.get("transfer-encoding") == 'chunked':
             wrapper = self._base_deserialize.deserialize_data(response.json(), 'VssJsonCollectionWrapper')
@@ -145,11 +315,21 @@ class Client(object):
         return new_template
 
     def _get_resource_location(self, location_id):
-        if self.config.base_url not in Client._locations_cache:
-            Client._locations_cache[self.config.base_url] = self._get_resource_locations(all_host_types=False)
-        for location in Client._locations_cache[self.config.base_url]:
-            if location.id == location_id:
-                return location
+        locations_by_id = Client._locations_cache.get(self.config.base_url)
+        if locations_by_id is None:
+            # only lookups for the same url wait on each other, other organizations and services go ahead
+            with Client._get_locations_lock(self.config.base_url):
+                locations_by_id = Client._locations_cache.get(self.config.base_url)
+                if locations_by_id is None:
+                    locations = self._get_resource_locations(all_host_types=False)
+                    locations_by_id = {location.id: location for location in locations or []}
+                    Client._locations_cache[self.config.base_url] = locations_by_id
+        return locations_by_id.get(location_id)
+
+    @staticmethod
+    def _get_locations_lock(base_url):
+        with Client._locations_lock:
+            return Client._locations_locks.setdefault(base_url, threading.RLock())
 
     def _get_resource_locations(self, all_host_types):
         # Check local client's cached Options first
@@ -165,6 +345,10 @@ class Client(object):
                 logger.debug('File cache hit for options on: %s', self.normalized_url)
                 self._locations = self._base_deserialize.deserialize_data(OPTIONS_FILE_CACHE[self.normalized_url],
                                                                           '[ApiResourceLocation]')
+                if OPTIONS_FILE_CACHE.is_stale(self.normalized_url):
+                    logger.debug('Refreshing stale options in the background for: %s', self.normalized_url)
+                    refresh_in_background(OPTIONS_FILE_CACHE, self.normalized_url,
+                                          lambda: self._fetch_resource_locations(all_host_types=False)[1])
                 return self._locations
             except DeserializationError as ex:
                 logger.debug(ex, exc_info=True)
@@ -172,6 +356,21 @@ class Client(object):
             logger.debug('File cache miss for options on: %s', self.normalized_url)
 
         # Last resort, make the call to the server
+        returned_locations, collection = self._fetch_resource_locations(all_host_types)
+        if all_host_types:
+            self._all_host_types_locations = returned_locations
+        else:
+            self._locations = returned_locations
+            try:
+                OPTIONS_FILE_CACHE[self.normalized_url] = collection
+            except SerializationError as ex:
+                logger.debug(ex, exc_info=True)
+        return returned_locations
+
+    def _fetch_resource_locations(self, all_host_types):
+        """Sends the OPTIONS request listing the resource locations of the server.
+        :rtype: tuple of the deserialized locations and the raw collection to cache
+        """
         options_uri = self._combine_url(self.config.base_url, '_apis')
         request = ClientRequest(method='OPTIONS', url=self._client.format_url(options_uri))
         if all_host_types:
@@ -189,20 +388,20 @@ class Client(object):
         collection = wrapper.value
         returned_locations = self._base_deserialize('[ApiResourceLocation]',
                                                     collection)
-        if all_host_types:
-            self._all_host_types_locations = returned_locations
-        else:
-            self._locations = returned_locations
-            try:
-                OPTIONS_FILE_CACHE[self.normalized_url] = wrapper.value
-            except SerializationError as ex:
-                logger.debug(ex, exc_info=True)
-        return returned_locations
+        return returned_locations, collection
 
     @staticmethod
     def _negotiate_request_version(location, version):
         if location is None or version is None:
             return version
+        key = (location.id, location.min_version, location.max_version, location.released_version,
+               location.resource_version, version)
+        if key not in Client._negotiated_versions:
+            Client._negotiated_versions[key] = Client._negotiate_request_version_uncached(location, version)
+        return Client._negotiated_versions[key]
+
+    @staticmethod
+    def _negotiate_request_version_uncached(location, version):
         pattern = r'(\d+(\.\d)?)(-preview(.(\d+))?)?'
         match = re.match(pattern, version)
         requested_api_version = match.group(1)
@@ -282,10 +481,36 @@ class Client(object):
         return url.rstrip('/').lower()
 
     _locations_cache = {}
+    _locations_locks = {}
+    _locations_lock = threading.Lock()
+    _negotiated_versions = {}
+    _model_registry = {}
+    _model_registry_lock = threading.Lock()
     _continuation_token_header_key = 'X-MS-ContinuationToken'
     _session_header_key = 'X-TFS-Session'
     _session_data = {_session_header_key: str(uuid.uuid4())}
 
 
+class _SharedSessionHTTPSender(RequestsHTTPSender):
+    """Sends the requests of every thread on one shared session.
+    msrest keeps a session per thread and initializes any other session passed to a call again, wrapping its
+    redirect handling once more each time. The shared session is initialized once here instead.
+    """
+
+    def __init__(self, session, config=None):
+        super(_SharedSessionHTTPSender, self).__init__(config)
+        self._init_session(session)
+        self._shared_session = session
+
+    @property
+    def session(self):
+        return self._shared_session
+
+    @session.setter
+    def session(self, value):
+        self._init_session(value)
+        self._shared_session = value
+
+
 TRACE_ENV_VAR_COMPAT = 'vsts_python_print_urls'
 TRACE_ENV_VAR = 'azure_devops_python_print_urls'
@@ -5,23 +5,25 @@
 
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
 from msrest.service_client import ServiceClient
-from ._file_cache import RESOURCE_CACHE as RESOURCE_FILE_CACHE
+from ._file_cache import RESOURCE_CACHE as RESOURCE_FILE_CACHE, refresh_in_background
+from ._throttling import TokenBucket, DEFAULT_REQUEST_RATE
 from .client_configuration import ClientConfiguration
 from .exceptions import AzureDevOpsClientRequestError
-from .released.client_factory import ClientFactory
-from .v5_0.location.location_client import LocationClient
-from .v5_0.client_factory import ClientFactoryV5_0
-from .v5_1.client_factory import ClientFactoryV5_1
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+
 
 class Connection(object):
     """Connection.
     """
 
-    def __init__(self, base_url=None, creds=None, user_agent=None):
+    def __init__(self, base_url=None, creds=None, user_agent=None, pool_size=DEFAULT_POOL_SIZE,
+                 request_rate=DEFAULT_REQUEST_RATE):
         self._config = ClientConfiguration(base_url)
         self._config.credentials = creds
         self._addition_user_agent = user_agent
@@ -32,11 +34,43 @@ class Connection(object):
         self.base_url = base_url
         self._creds = creds
         self._resource_areas = None
-        self.clients = ClientFactory(self)
-        self.clients_v5_0 = ClientFactoryV5_0(self)
-        self.clients_v5_1 = ClientFactoryV5_1(self)
+        self._pool_size = pool_size
+        self._session = None
+        self.request_cache = None
+        self.http_cache = None
+        self.rate_limiter = TokenBucket(rate=request_rate)
+        self._async_executor = None
+        self._clients = None
+        self._clients_v5_0 = None
+        self._clients_v5_1 = None
         self.use_fiddler = False
 
+    @property
+    def credentials(self):
+        """The credentials all clients of this connection authenticate with."""
+        return self._creds
+
+    @property
+    def clients(self):
+        if self._clients is None:
+            from .released.client_factory import ClientFactory
+            self._clients = ClientFactory(self)
+        return self._clients
+
+    @property
+    def clients_v5_0(self):
+        if self._clients_v5_0 is None:
+            from .v5_0.client_factory import ClientFactoryV5_0
+            self._clients_v5_0 = ClientFactoryV5_0(self)
+        return self._clients_v5_0
+
+    @property
+    def clients_v5_1(self):
+        if self._clients_v5_1 is None:
+            from .v5_1.client_factory import ClientFactoryV5_1
+            self._clients_v5_1 = ClientFactoryV5_1(self)
+        return self._clients_v5_1
+
     def get_client(self, client_type):
         """get_client.
         """
@@ -45,6 +79,22 @@ class Connection(object):
             self._client_cache[client_type] = self._get_client_instance(client_class)
         return self._client_cache[client_type]
 
+    def get_async_client(self, client_type, max_concurrency=None):
+        """get_async_client.
+        Returns the client wrapped so its operations can be awaited concurrently on an event loop.
+        Concurrency defaults to the connection pool size; a larger value would just queue on the pool.
+        All async clients of the connection send their requests on one shared set of worker threads.
+        :rtype: :class:`<AsyncClient> <azext_devops.devops_sdk.async_client.AsyncClient>`
+        """
+        from .async_client import AsyncClient
+        if max_concurrency is None:
+            max_concurrency = self._pool_size
+        if self._async_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._async_executor = ThreadPoolExecutor(max_workers=self._pool_size)
+        return AsyncClient(self.get_client(client_type), max_concurrency=max_concurrency,
+                           executor=self._async_executor)
+
     @staticmethod
     def _get_class(full_class_name):
         parts = full_class_name.split('.')
@@ -58,10 +108,56 @@ class Connection(object):
         url = self._get_url_for_client_instance(client_class)
         client = client_class(url, self._creds)
         client.add_user_agent(self._addition_user_agent)
+        client.set_session(self.get_session())
+        client.set_rate_limiter(self.rate_limiter)
+        client.set_request_cache(self.request_cache)
+        client.set_http_cache(self.http_cache)
         if self.use_fiddler:
             self._configure_client_for_fiddler(client)
         return client
 
+    def enable_request_cache(self):
+        """enable_request_cache.
+        Makes all clients of this connection share one in memory GET response cache for the lifetime of the
+        connection. Identical concurrent GETs are coalesced, and any write clears the cache.
+        :rtype: :class:`<RequestCache> <azext_devops.devops_sdk._request_cache.RequestCache>`
+        """
+        if self.request_cache is None:
+            from ._request_cache import RequestCache
+            self.request_cache = RequestCache()
+            for client in self._client_cache.values():
+                client.set_request_cache(self.request_cache)
+        return self.request_cache
+
+    def enable_http_cache(self, cache_dir, max_size=None):
+        """enable_http_cache.
+        Makes all clients of this connection keep JSON GET responses in a disk cache under cache_dir and
+        revalidate them with ETag / Last-Modified conditional requests, so unchanged resources are not
+        downloaded again by later invocations.
+        :param str cache_dir: Directory to keep the cached responses in.
+        :param int max_size: Size in bytes above which least recently used responses are evicted.
+        :rtype: :class:`<HttpCache> <azext_devops.devops_sdk._http_cache.HttpCache>`
+        """
+        from ._http_cache import HttpCache, DEFAULT_MAX_SIZE
+        self.http_cache = HttpCache(cache_dir, max_size=max_size or DEFAULT_MAX_SIZE)
+        for client in self._client_cache.values():
+            client.set_http_cache(self.http_cache)
+        return self.http_cache
+
+    def get_session(self):
+        """get_session.
+        Returns the requests session shared by all clients of this connection. The session keeps one
+        keep-alive connection pool per host, so clients talking to the same host reuse connections.
+        :rtype: :class:`<Session> <requests.Session>`
+        """
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self._pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+
     def _get_url_for_client_instance(self, client_class):
         resource_id = client_class.resource_area_identifier
         if resource_id is None:
@@ -91,19 +187,58 @@ class Connection(object):
         resource_id = resource_id.lower()
         if resource_id in _deployment_level_resource_areas:
             return _deployment_level_resource_areas[resource_id]
+        from .v5_0.location.location_client import LocationClient
         location_client = LocationClient(sps_url, self._creds)
+        location_client.set_session(self.get_session())
+        location_client.set_rate_limiter(self.rate_limiter)
         if self.use_fiddler:
             self._configure_client_for_fiddler(location_client)
-        resource_area = location_client.get_resource_area(area_id=resource_id)
+        # deployment level areas are the same for every organization, so they are cached by area id only
+        if RESOURCE_FILE_CACHE[resource_id]:
+            try:
+                logger.debug('File cache hit for deployment level resource area: %s', resource_id)
+                resource_area = location_client._base_deserialize.deserialize_data(RESOURCE_FILE_CACHE[resource_id],
+                                                                                   'ResourceAreaInfo')
+                if RESOURCE_FILE_CACHE.is_stale(resource_id):
+                    refresh_in_background(RESOURCE_FILE_CACHE, resource_id,
+                                          lambda: self._fetch_deployment_resource_area(location_client,
+                                                                                       resource_id)[1])
+                _deployment_level_resource_areas[resource_id] = resource_area
+                return resource_area
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug(ex, exc_info=True)
+        else:
+            logger.debug('File cache miss for deployment level resource area: %s', resource_id)
+        resource_area, serialized = self._fetch_deployment_resource_area(location_client, resource_id)
+        if serialized is not None:
+            RESOURCE_FILE_CACHE[resource_id] = serialized
         _deployment_level_resource_areas[resource_id] = resource_area
         return resource_area
 
+    @staticmethod
+    def _fetch_deployment_resource_area(location_client, resource_id):
+        """Requests a deployment level resource area from SPS.
+        :rtype: tuple of the resource area and its serialized form to cache, None if there is nothing to cache
+        """
+        resource_area = location_client.get_resource_area(area_id=resource_id)
+        if resource_area is None:
+            return None, None
+        try:
+            serialized = location_client._base_serialize.serialize_data(resource_area, 'ResourceAreaInfo')
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug(ex, exc_info=True)
+            serialized = None
+        return resource_area, serialized
+
     def authenticate(self):
         self._get_resource_areas(force=True)
 
     def _get_resource_areas(self, force=False):
         if self._resource_areas is None or force:
+            from .v5_0.location.location_client import LocationClient
             location_client = LocationClient(self.base_url, self._creds)
+            location_client.set_session(self.get_session())
+            location_client.set_rate_limiter(self.rate_limiter)
             if self.use_fiddler:
                 self._configure_client_for_fiddler(location_client)
             if not force and RESOURCE_FILE_CACHE[location_client.normalized_url]:
@@ -111,23 +246,37 @@ class Connection(object):
                     logger.debug('File cache hit for resources on: %s', location_client.normalized_url)
                     self._resource_areas = location_client._base_deserialize.deserialize_data(RESOURCE_FILE_CACHE[location_client.normalized_url],
                                                                                               '[ResourceAreaInfo]')
+                    if RESOURCE_FILE_CACHE.is_stale(location_client.normalized_url):
+                        logger.debug('Refreshing stale resources in the background for: %s',
+                                     location_client.normalized_url)
+                        refresh_in_background(RESOURCE_FILE_CACHE, location_client.normalized_url,
+                                              lambda: self._fetch_resource_areas(location_client)[1])
                     return self._resource_areas
                 except Exception as ex:
                     logger.debug(ex, exc_info=True)
             elif not force:
                 logger.debug('File cache miss for resources on: %s', location_client.normalized_url)
-            self._resource_areas = location_client.get_resource_areas()
-            if self._resource_areas is None:
-                # For OnPrem environments we get an empty collection wrapper.
-                self._resource_areas = []
-            try:
-                serialized = location_client._base_serialize.serialize_data(self._resource_areas,
-                                                                            '[ResourceAreaInfo]')
+            self._resource_areas, serialized = self._fetch_resource_areas(location_client)
+            if serialized is not None:
                 RESOURCE_FILE_CACHE[location_client.normalized_url] = serialized
-            except Exception as ex:
-                logger.debug(ex, exc_info=True)
         return self._resource_areas
 
+    @staticmethod
+    def _fetch_resource_areas(location_client):
+        """Requests the resource areas of the organization.
+        :rtype: tuple of the resource areas and their serialized form to cache, None if serialization failed
+        """
+        resource_areas = location_client.get_resource_areas()
+        if resource_areas is None:
+            # For OnPrem environments we get an empty collection wrapper.
+            resource_areas = []
+        try:
+            serialized = location_client._base_serialize.serialize_data(resource_areas, '[ResourceAreaInfo]')
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.debug(ex, exc_info=True)
+            serialized = None
+        return resource_areas, serialized
+
     @staticmethod
     def _combine_url(part1, part2):
         return part1.rstrip('/') + '/' + part2.strip('/')
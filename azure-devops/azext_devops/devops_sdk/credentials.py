@@ -3,7 +3,43 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import base64
+import hashlib
+import json
+import logging
+
 from msrest.authentication import (
     BasicAuthentication,
     BasicTokenAuthentication,
     OAuthTokenAuthentication)
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_credential_fingerprint(credentials):
+    """Returns a hash identifying who credentials belong to, or None if they cannot be identified.
+    The token itself is never part of anything stored: AAD tokens are JWTs that are refreshed every hour,
+    so they are identified by tenant and user instead, which keeps the hash stable across refreshes.
+    :param credentials: BasicAuthentication or BasicTokenAuthentication credentials.
+    :rtype: str
+    """
+    if isinstance(credentials, BasicAuthentication):
+        token = credentials.password
+    elif isinstance(credentials, BasicTokenAuthentication):
+        token = (credentials.token or {}).get('access_token')
+    else:
+        token = None
+    if not token:
+        return None
+    identity = token
+    parts = token.split('.')
+    if len(parts) == 3:
+        try:
+            payload = parts[1] + '=' * (-len(parts[1]) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload.encode('utf-8')).decode('utf-8'))
+            if claims.get('tid') and claims.get('oid'):
+                identity = 'aad:{}:{}'.format(claims['tid'], claims['oid'])
+        except (ValueError, TypeError) as ex:
+            logger.debug(ex, exc_info=True)
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
@@ -6,7 +6,6 @@
 # Changes may cause incorrect behavior and will be lost if the code is regenerated.
 # --------------------------------------------------------------------------------------------
 
-from msrest import Serializer, Deserializer
 from ...client import Client
 from ...v5_1.accounts import models
 
@@ -19,9 +18,7 @@ class AccountsClient(Client):
 
     def __init__(self, base_url=None, creds=None):
         super(AccountsClient, self).__init__(base_url, creds)
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize, self._deserialize = self._get_model_registry(models)
 
     resource_area_identifier = '0d55247a-1c47-4462-9b1f-5e2125590ee6'
 
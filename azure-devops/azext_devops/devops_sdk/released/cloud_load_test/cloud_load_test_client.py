@@ -6,7 +6,6 @@
 # Changes may cause incorrect behavior and will be lost if the code is regenerated.
 # --------------------------------------------------------------------------------------------
 
-from msrest import Serializer, Deserializer
 from ...client import Client
 from ...v5_1.cloud_load_test import models
 
@@ -19,9 +18,7 @@ class CloudLoadTestClient(Client):
 
     def __init__(self, base_url=None, creds=None):
         super(CloudLoadTestClient, self).__init__(base_url, creds)
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize, self._deserialize = self._get_model_registry(models)
 
     resource_area_identifier = '7ae6d0a6-cda5-44cf-a261-28c392bed25c'
 
@@ -6,7 +6,6 @@
 # Changes may cause incorrect behavior and will be lost if the code is regenerated.
 # --------------------------------------------------------------------------------------------
 
-from msrest import Serializer, Deserializer
 from ...client import Client
 from ...v5_1.core import models
 
@@ -19,9 +18,7 @@ class CoreClient(Client):
 
     def __init__(self, base_url=None, creds=None):
         super(CoreClient, self).__init__(base_url, creds)
-        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
-        self._serialize = Serializer(client_models)
-        self._deserialize = Deserializer(client_models)
+        self._serialize, self._deserialize = self._get_model_registry(models)
 
     resource_area_identifier = '79134c72-4a58-4b42-976c-04e7115f32bf'
 
@@ -0,0 +1,101 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+from knack.util import CLIError
+
+from azext_devops.devops_sdk._file_cache import get_cache
+from azext_devops.devops_sdk.v5_0.work_item_tracking.models import (WorkArtifactLink, WorkItem,
+                                                                    WorkItemRelation, WorkItemRelationType)
+from azext_devops.dev.boards.relations import add_relation, remove_relation, show_work_item
+from azext_devops.dev.common.services import clear_connection_cache
+from azext_devops.tests.utils.authentication import AuthenticatedTests
+from azext_devops.tests.utils.helper import get_client_mock_helper
+from .test_boards_helper import TEST_DEVOPS_ORGANIZATION, WORK_ITEM_TRACKING_CLIENT_LOCATION
+
+
+class TestBoardsRelationMethods(AuthenticatedTests):
+
+    _PARENT = WorkItemRelationType(name='Parent', reference_name='System.LinkTypes.Hierarchy-Reverse')
+    _CHILD = WorkItemRelationType(name='Child', reference_name='System.LinkTypes.Hierarchy-Forward')
+
+    def setUp(self):
+        self.authentication_setup()
+        self.authenticate()
+        self.cache_dir = tempfile.mkdtemp()
+        patch('azext_devops.devops_sdk.connection.Connection.get_client', new=get_client_mock_helper).start()
+        patch('azext_devops.dev.boards.relations._relation_types_cache',
+              get_cache('work_item_relation_types', cache_dir=self.cache_dir)).start()
+        patch('azext_devops.dev.boards.relations._artifact_link_types_cache',
+              get_cache('work_item_artifact_link_types', cache_dir=self.cache_dir)).start()
+        self.mock_get_relation_types = patch(WORK_ITEM_TRACKING_CLIENT_LOCATION + 'get_relation_types',
+                                             return_value=[self._PARENT]).start()
+        self.mock_get_artifact_link_types = patch(WORK_ITEM_TRACKING_CLIENT_LOCATION + 'get_work_artifact_link_types',
+                                                  return_value=[WorkArtifactLink(link_type='Build')]).start()
+        self.mock_get_WI = patch(WORK_ITEM_TRACKING_CLIENT_LOCATION + 'get_work_item').start()
+        self.mock_update_WI = patch(WORK_ITEM_TRACKING_CLIENT_LOCATION + 'update_work_item').start()
+        self.mock_get_WI.side_effect = lambda id, expand: WorkItem(id=id, relations=[
+            WorkItemRelation(rel='System.LinkTypes.Hierarchy-Reverse', url='https://someorg/_apis/wit/workItems/2')])
+        clear_connection_cache()
+
+    def tearDown(self):
+        patch.stopall()
+        shutil.rmtree(self.cache_dir)
+
+    def test_relation_types_are_cached(self):
+        show_work_item(id=1, organization=TEST_DEVOPS_ORGANIZATION)
+        response = show_work_item(id=1, organization=TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.mock_get_relation_types.assert_called_once()
+        self.assertEqual(response.relations[0].rel, 'Parent')
+
+    def test_add_relation_refreshes_cached_relation_types_missing_the_type(self):
+        show_work_item(id=1, organization=TEST_DEVOPS_ORGANIZATION)
+        self.mock_get_relation_types.return_value = [self._PARENT, self._CHILD]
+
+        add_relation(id=1, relation_type='child', target_url='https://someorg/_apis/wit/workItems/3',
+                     artifact_link_type='build', organization=TEST_DEVOPS_ORGANIZATION)
+        add_relation(id=1, relation_type='child', target_url='https://someorg/_apis/wit/workItems/4',
+                     artifact_link_type='build', organization=TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual(self.mock_get_relation_types.call_count, 2)
+        self.mock_get_artifact_link_types.assert_called_once()
+        operation = self.mock_update_WI.call_args[1]['document'][0]
+        self.assertEqual(operation.value.rel, 'System.LinkTypes.Hierarchy-Forward')
+        self.assertEqual(operation.value.attributes, {'name': 'Build'})
+
+    def test_remove_relation_does_not_get_targets(self):
+        relations = [WorkItemRelation(rel='System.LinkTypes.Hierarchy-Reverse',
+                                      url='https://someorg/_apis/wit/workItems/{}'.format(target_id))
+                     for target_id in range(2, 8)]
+        self.mock_get_WI.side_effect = lambda id, expand: WorkItem(id=id, relations=relations)
+
+        remove_relation(id=1, relation_type='parent', target_id='3,6,4', organization=TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual(self.mock_get_WI.call_count, 2)
+        document = self.mock_update_WI.call_args[1]['document']
+        self.assertEqual([operation.path for operation in document], ['/relations/4', '/relations/2', '/relations/1'])
+
+    def test_remove_relation_raises_for_unrelated_targets(self):
+        with self.assertRaises(CLIError):
+            remove_relation(id=1, relation_type='parent', target_id='2,9', organization=TEST_DEVOPS_ORGANIZATION)
+        self.mock_update_WI.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import shutil
+import tempfile
 import unittest
 
 try:
@@ -12,7 +15,15 @@ except ImportError:
     # Attempt to load mock (works on Python version below 3.3)
     from mock import patch
 
-from azext_devops.dev.boards.work_item import (delete_work_item,
+from knack.util import CLIError
+
+from azext_devops.devops_sdk.exceptions import AzureDevOpsAuthenticationError, AzureDevOpsClientRequestError
+from azext_devops.devops_sdk.v5_0.identity.models import Identity
+from azext_devops.devops_sdk.v5_0.work_item_tracking.models import (WorkItem, WorkItemQueryResult,
+                                                                    WorkItemReference, WorkItemFieldReference)
+from azext_devops.dev.boards.work_item import (bulk_work_items,
+                                            delete_work_item,
+                                            query_work_items,
                                             show_work_item)
 from azext_devops.dev.common.services import clear_connection_cache
 from azext_devops.tests.utils.helper import get_client_mock_helper, TEST_DEVOPS_ORG_URL
@@ -167,6 +178,132 @@ class TestWorkItemMethods(AuthenticatedTests):
         self.mock_delete_WI.assert_called_once_with(id=test_work_item_id, project='test', destroy=False)
         self.mock_validate_token.assert_not_called()
 
+    def test_query_work_items_gets_all_results_in_batches(self):
+        query_result = WorkItemQueryResult(columns=[WorkItemFieldReference(reference_name='System.Id')],
+                                           work_items=[WorkItemReference(id=i) for i in range(2500, 0, -1)])
+
+        def get_work_items_batch(work_item_get_request):
+            # return each batch out of order to check the results are put back in query order
+            return [WorkItem(id=i) for i in reversed(work_item_get_request.ids)]
+
+        with patch('azext_devops.devops_sdk.v5_0.work_item_tracking.work_item_tracking_client.WorkItemTrackingClient.query_by_wiql',
+                   return_value=query_result), \
+                patch('azext_devops.devops_sdk.v5_0.work_item_tracking.work_item_tracking_client.WorkItemTrackingClient.get_work_items_batch',
+                      side_effect=get_work_items_batch) as mock_get_batch:
+            response = query_work_items(wiql='select [System.Id] from WorkItems',
+                                        organization=self._TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual(mock_get_batch.call_count, 13)
+        for call in mock_get_batch.call_args_list:
+            request = call[1]['work_item_get_request']
+            self.assertTrue(len(request.ids) <= 200)
+            self.assertEqual(request.fields, ['System.Id'])
+        self.assertEqual([work_item.id for work_item in response], list(range(2500, 0, -1)))
+
+    def test_bulk_work_items_from_csv(self):
+        bulk_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bulk_dir)
+        file_path = os.path.join(bulk_dir, 'bulk.csv')
+        with open(file_path, 'w') as bulk_file:
+            bulk_file.write('id,title,System.Tags,type\n'
+                            ',First,tag1,\n'
+                            ',Second,,Bug\n'
+                            '7,Renamed,,\n'
+                            ',,tag2,\n')
+        self.mock_create_WI.side_effect = lambda document, project, type: WorkItem(id=len(document))
+
+        with patch('azext_devops.devops_sdk.v5_0.work_item_tracking.work_item_tracking_client.WorkItemTrackingClient.update_work_item',
+                   return_value=WorkItem(id=7)) as mock_update_WI:
+            response = bulk_work_items(file_path=file_path, work_item_type='Task', project='Project',
+                                       organization=self._TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual([(result['line'], result['status']) for result in response],
+                         [(2, 'created'), (3, 'created'), (4, 'updated'), (5, 'failed')])
+        self.assertEqual(response[3]['error'], 'A title is required to create a work item.')
+        self.assertEqual(self.mock_create_WI.call_count, 2)
+        types = sorted(call[1]['type'] for call in self.mock_create_WI.call_args_list)
+        self.assertEqual(types, ['Bug', 'Task'])
+        update_document = mock_update_WI.call_args[1]['document']
+        self.assertEqual([(operation.path, operation.value) for operation in update_document],
+                         [('/fields/System.Title', 'Renamed')])
+        self.assertEqual(mock_update_WI.call_args[1]['id'], 7)
+
+    def test_bulk_work_items_from_ndjson(self):
+        bulk_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bulk_dir)
+        file_path = os.path.join(bulk_dir, 'bulk.ndjson')
+        with open(file_path, 'w') as bulk_file:
+            bulk_file.write('{"title": "First", "type": "Task", "Microsoft.VSTS.Common.Priority": 1}\n'
+                            '\n'
+                            'not json\n')
+        self.mock_create_WI.return_value = WorkItem(id=1)
+
+        response = bulk_work_items(file_path=file_path, project='Project',
+                                   organization=self._TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual([(result['line'], result['id'], result['status']) for result in response],
+                         [(1, 1, 'created'), (3, None, 'failed')])
+        document = self.mock_create_WI.call_args[1]['document']
+        self.assertIn(('/fields/Microsoft.VSTS.Common.Priority', 1),
+                      [(operation.path, operation.value) for operation in document])
+
+    def test_bulk_work_items_reports_errors_per_row(self):
+        bulk_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bulk_dir)
+        file_path = os.path.join(bulk_dir, 'bulk.csv')
+        with open(file_path, 'w') as bulk_file:
+            bulk_file.write('id,title\n7,Missing\n8,Unauthorized\n9,Renamed\n')
+
+        def update_work_item(document, id):
+            if id == 7:
+                raise AzureDevOpsClientRequestError('Page not found. Operation returned a 404 status code.')
+            if id == 8:
+                raise AzureDevOpsAuthenticationError('The requested resource requires user authentication.')
+            return WorkItem(id=id)
+
+        with patch('azext_devops.devops_sdk.v5_0.work_item_tracking.work_item_tracking_client.WorkItemTrackingClient.update_work_item',
+                   side_effect=update_work_item) as mock_update_WI, \
+                patch('azext_devops.dev.boards.work_item.time.sleep') as mock_sleep:
+            response = bulk_work_items(file_path=file_path, organization=self._TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        self.assertEqual([(result['id'], result['status']) for result in response],
+                         [(7, 'failed'), (8, 'failed'), (9, 'updated')])
+        self.assertEqual(mock_update_WI.call_count, 3)
+        mock_sleep.assert_not_called()
+
+    def test_bulk_work_items_resolves_assignees_once(self):
+        bulk_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bulk_dir)
+        file_path = os.path.join(bulk_dir, 'bulk.csv')
+        with open(file_path, 'w') as bulk_file:
+            bulk_file.write('title,assigned-to\n'
+                            'First,alias1\n'
+                            'Second,alias1\n'
+                            'Third,unknown\n'
+                            'Fourth,First Last\n')
+        self.mock_create_WI.side_effect = lambda document, project, type: WorkItem(id=len(document))
+        identities = {'alias1': Identity(properties={'Account': {'$value': 'alias1@contoso.com'}}),
+                      'unknown': CLIError('Could not resolve identity: unknown')}
+
+        with patch('azext_devops.dev.boards.work_item.resolve_identities',
+                   return_value=identities) as mock_resolve_identities:
+            response = bulk_work_items(file_path=file_path, work_item_type='Task', project='Project',
+                                       organization=self._TEST_DEVOPS_ORGANIZATION)
+
+        # assert
+        mock_resolve_identities.assert_called_once_with(['alias1', 'unknown'], self._TEST_DEVOPS_ORGANIZATION,
+                                                        return_errors=True)
+        self.assertEqual([(result['line'], result['status']) for result in response],
+                         [(2, 'created'), (3, 'created'), (4, 'failed'), (5, 'created')])
+        self.assertEqual(response[2]['error'], 'Could not resolve identity: unknown')
+        assigned = sorted(operation.value for call in self.mock_create_WI.call_args_list
+                          for operation in call[1]['document'] if operation.path == '/fields/System.AssignedTo')
+        self.assertEqual(assigned, ['First Last', 'alias1@contoso.com', 'alias1@contoso.com'])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
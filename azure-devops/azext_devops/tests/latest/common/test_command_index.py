@@ -0,0 +1,60 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+from azure.cli.core.mock import DummyCli
+
+from azext_devops import DevCommandsLoader, _get_areas_for_command
+from azext_devops._command_index import COMMAND_INDEX
+
+
+class TestCommandIndex(unittest.TestCase):
+
+    def test_command_index_is_up_to_date(self):
+        with patch('azext_devops._is_cli_command_index_complete', return_value=False):
+            command_table = DevCommandsLoader(DummyCli()).load_command_table(None)
+        groups = {}
+        for cmd_name, cmd in command_table.items():
+            area = cmd.command_kwargs['operations_tmpl'].split('#')[0].split('.')[2]
+            groups.setdefault(cmd_name.rsplit(' ', 1)[0], set()).add(area)
+        self.assertEqual({group: sorted(areas) for group, areas in groups.items()}, COMMAND_INDEX,
+                         'Command groups changed, run scripts/generateCommandIndex.py')
+
+    def test_get_areas_for_command(self):
+        self.assertEqual(_get_areas_for_command(['repos', 'pr', 'list', '--org', 'x']), ['repos'])
+        self.assertEqual(_get_areas_for_command(['boards', 'work-item', 'relation', 'add']), ['boards'])
+        self.assertEqual(_get_areas_for_command(['devops', 'admin', 'banner', 'list']), ['admin'])
+        self.assertEqual(_get_areas_for_command(['devops', 'login']), ['team'])
+        # parent groups need every area contributing a sub group
+        self.assertEqual(_get_areas_for_command(['devops', '-h']), ['admin', 'team'])
+        # unknown or empty commands load everything
+        all_areas = ['admin', 'boards', 'pipelines', 'repos', 'team', 'artifacts']
+        self.assertEqual(_get_areas_for_command(['boardz']), all_areas)
+        self.assertEqual(_get_areas_for_command(['-h']), all_areas)
+        self.assertEqual(_get_areas_for_command(None), all_areas)
+
+    def test_load_command_table_only_loads_invoked_area(self):
+        with patch('azext_devops._is_cli_command_index_complete', return_value=True):
+            command_table = DevCommandsLoader(DummyCli()).load_command_table(['pipelines', 'runs', 'list'])
+        self.assertIn('pipelines runs list', command_table)
+        self.assertTrue(all(name.startswith('pipelines') for name in command_table))
+
+    def test_load_command_table_loads_all_areas_without_cli_index(self):
+        with patch('azext_devops._is_cli_command_index_complete', return_value=False):
+            command_table = DevCommandsLoader(DummyCli()).load_command_table(['pipelines', 'runs', 'list'])
+        self.assertIn('repos pr list', command_table)
+        self.assertIn('pipelines runs list', command_table)
+
+
+if __name__ == '__main__':
+    unittest.main()
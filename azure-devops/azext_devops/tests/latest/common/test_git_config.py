@@ -0,0 +1,116 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+from azext_devops.dev.common import git
+from azext_devops.dev.common.git_config import (read_current_branch_name,
+                                                read_git_remotes,
+                                                UnsupportedGitSetupError)
+
+_CONFIG = '''[core]
+\trepositoryformatversion = 0
+\tbare = false
+[remote "origin"]
+\turl = https://dev.azure.com/AzureDevOpsCliTest/Project/_git/Repo ; the main remote
+\tfetch = +refs/heads/*:refs/remotes/origin/*
+[remote "mirror"]
+\turl = "git@ssh.dev.azure.com:v3/AzureDevOpsCliTest/Project/Repo"
+\tpushurl = https://AzureDevOpsCliTest.visualstudio.com/Project/_git/Mirror
+[branch "master"]
+\tremote = origin
+'''
+
+
+class TestGitConfigMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.repo = os.path.join(self.root, 'repo')
+        self.git_dir = os.path.join(self.repo, '.git')
+        os.makedirs(os.path.join(self.git_dir, 'objects'))
+        os.makedirs(os.path.join(self.git_dir, 'refs'))
+        self._write(os.path.join(self.git_dir, 'config'), _CONFIG)
+        self._write(os.path.join(self.git_dir, 'HEAD'), 'ref: refs/heads/feature/x\n')
+        home_patcher = patch.dict(os.environ, {'HOME': self.root, 'XDG_CONFIG_HOME': self.root})
+        home_patcher.start()
+        self.addCleanup(home_patcher.stop)
+        for variable in ('GIT_DIR', 'GIT_WORK_TREE', 'GIT_COMMON_DIR', 'GIT_CEILING_DIRECTORIES'):
+            os.environ.pop(variable, None)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    @staticmethod
+    def _write(file_name, content):
+        with open(file_name, 'w') as file:
+            file.write(content)
+
+    def test_read_git_remotes(self):
+        remotes = read_git_remotes(os.path.join(self.repo))
+        self.assertEqual(remotes, {
+            'origin(fetch)': 'https://dev.azure.com/AzureDevOpsCliTest/Project/_git/Repo',
+            'origin(push)': 'https://dev.azure.com/AzureDevOpsCliTest/Project/_git/Repo',
+            'mirror(fetch)': 'git@ssh.dev.azure.com:v3/AzureDevOpsCliTest/Project/Repo',
+            'mirror(push)': 'https://AzureDevOpsCliTest.visualstudio.com/Project/_git/Mirror'})
+
+    def test_read_git_remotes_from_subdirectory_and_worktree(self):
+        sub_dir = os.path.join(self.repo, 'src', 'module')
+        os.makedirs(sub_dir)
+        self.assertIn('origin(fetch)', read_git_remotes(sub_dir))
+        worktree = os.path.join(self.root, 'worktree')
+        worktree_git_dir = os.path.join(self.git_dir, 'worktrees', 'worktree')
+        os.makedirs(worktree)
+        os.makedirs(worktree_git_dir)
+        self._write(os.path.join(worktree, '.git'), 'gitdir: ' + worktree_git_dir + '\n')
+        self._write(os.path.join(worktree_git_dir, 'commondir'), '../..\n')
+        self._write(os.path.join(worktree_git_dir, 'HEAD'), 'ref: refs/heads/other\n')
+        self.assertIn('mirror(push)', read_git_remotes(worktree))
+        self.assertEqual(read_current_branch_name(worktree), 'other')
+
+    def test_read_git_remotes_outside_repository(self):
+        outside = os.path.join(self.root, 'outside')
+        os.makedirs(outside)
+        self.assertIsNone(read_git_remotes(outside))
+
+    def test_read_git_remotes_sees_config_changes(self):
+        self.assertNotIn('upstream(fetch)', read_git_remotes(self.repo))
+        self._write(os.path.join(self.git_dir, 'config'),
+                    _CONFIG + '[remote "upstream"]\n\turl = https://dev.azure.com/Other/P/_git/R\n')
+        self.assertEqual(read_git_remotes(self.repo)['upstream(fetch)'], 'https://dev.azure.com/Other/P/_git/R')
+
+    def test_url_rewrites_are_not_supported(self):
+        self._write(os.path.join(self.root, '.gitconfig'),
+                    '[url "git@ssh.dev.azure.com:v3/"]\n\tinsteadOf = https://dev.azure.com/\n')
+        with self.assertRaises(UnsupportedGitSetupError):
+            read_git_remotes(self.repo)
+
+    def test_read_current_branch_name(self):
+        self.assertEqual(read_current_branch_name(self.repo), 'feature/x')
+        self._write(os.path.join(self.git_dir, 'HEAD'), '9d8e5b3c1a0f4e2d6c7b8a9f0e1d2c3b4a5f6e7d\n')
+        self.assertIsNone(read_current_branch_name(self.repo))
+
+    def test_get_git_remotes_falls_back_to_git(self):
+        output = b'origin\thttps://dev.azure.com/Org/P/_git/R (fetch)\norigin\thttps://dev.azure.com/Org/P/_git/R (push)\n'
+        with patch('azext_devops.dev.common.git.read_git_remotes', side_effect=UnsupportedGitSetupError()), \
+                patch('azext_devops.dev.common.git._git_remotes', {}), \
+                patch('subprocess.check_output', return_value=output) as mock_check_output:
+            remotes = git.get_git_remotes()
+        mock_check_output.assert_called_once()
+        self.assertEqual(remotes['origin(push)'], 'https://dev.azure.com/Org/P/_git/R')
+
+
+if __name__ == '__main__':
+    unittest.main()
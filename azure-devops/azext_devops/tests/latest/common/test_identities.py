@@ -0,0 +1,108 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import threading
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import MagicMock, patch
+
+from knack.util import CLIError
+
+from azext_devops.devops_sdk._file_cache import get_cache
+from azext_devops.devops_sdk.v5_0.identity.models import Identity
+from azext_devops.dev.common.identities import (resolve_identities, resolve_identity, resolve_identity_as_id,
+                                                resolve_identities_as_ids)
+
+
+class TestIdentitiesMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+    _TEST_USER_ID = '3d9a5f60-4c1e-4b0b-8a52-7b6b5f2b9a11'
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.identity_client = MagicMock()
+        self.identity_client.read_identities.side_effect = self._read_identities
+        self.current_user = Identity(id='current', properties={'Domain': {'$value': 'contoso'}})
+        patchers = [patch('azext_devops.dev.common.identities._identity_cache',
+                          get_cache('identities', cache_dir=self.cache_dir)),
+                    patch('azext_devops.dev.common.identities.get_identity_client',
+                          return_value=self.identity_client),
+                    patch('azext_devops.dev.common.identities.get_current_identity',
+                          return_value=self.current_user)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    @staticmethod
+    def _read_identities(search_filter, filter_value):
+        if filter_value == 'unknown':
+            return []
+        return [Identity(id='id-' + filter_value, properties={})]
+
+    def test_resolved_identities_are_cached(self):
+        identity = resolve_identity('alias1', self._TEST_DEVOPS_ORGANIZATION)
+        self.assertEqual(identity.id, 'id-alias1')
+        self.identity_client.read_identities.reset_mock()
+        self.assertEqual(resolve_identity_as_id('Alias1', self._TEST_DEVOPS_ORGANIZATION), 'id-alias1')
+        self.identity_client.read_identities.assert_not_called()
+
+    def test_ambiguous_identities_prefer_the_current_users_domain(self):
+        self.identity_client.read_identities.side_effect = None
+        self.identity_client.read_identities.return_value = [
+            Identity(id='other', properties={'Domain': {'$value': 'fabrikam'}}),
+            Identity(id='same', properties={'Domain': {'$value': 'contoso'}})]
+        self.assertEqual(resolve_identity_as_id('user name', self._TEST_DEVOPS_ORGANIZATION), 'same')
+
+    def test_resolve_identities_as_ids(self):
+        resolve_identity('cached', self._TEST_DEVOPS_ORGANIZATION)
+        self.identity_client.read_identities.reset_mock()
+        resolved_ids = resolve_identities_as_ids(['alias1', self._TEST_USER_ID, 'cached', 'me', 'alias2', 'alias1'],
+                                                 self._TEST_DEVOPS_ORGANIZATION)
+        self.assertEqual(resolved_ids, ['id-alias1', self._TEST_USER_ID, 'id-cached', 'current', 'id-alias2',
+                                        'id-alias1'])
+        looked_up = sorted(call[1]['filter_value'] for call in self.identity_client.read_identities.call_args_list)
+        self.assertEqual(looked_up, ['alias1', 'alias2'])
+
+    def test_resolve_identities_as_ids_looks_up_concurrently(self):
+        # every lookup waits for the other one, so this only completes if both run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def read_identities(search_filter, filter_value):
+            barrier.wait()
+            return self._read_identities(search_filter, filter_value)
+
+        self.identity_client.read_identities.side_effect = read_identities
+        self.assertEqual(resolve_identities_as_ids(['alias1', 'alias2'], self._TEST_DEVOPS_ORGANIZATION),
+                         ['id-alias1', 'id-alias2'])
+
+    def test_resolve_identities_as_ids_raises_for_unknown_identities(self):
+        with self.assertRaises(CLIError) as context:
+            resolve_identities_as_ids(['alias1', 'unknown'], self._TEST_DEVOPS_ORGANIZATION)
+        self.assertEqual(str(context.exception), 'Could not resolve identity: unknown')
+
+    def test_resolve_identities_can_return_errors(self):
+        identities = resolve_identities(['alias1', 'unknown'], self._TEST_DEVOPS_ORGANIZATION, return_errors=True)
+        self.assertEqual(identities['alias1'].id, 'id-alias1')
+        self.assertIsInstance(identities['unknown'], CLIError)
+        # only resolved identities are cached
+        self.identity_client.read_identities.reset_mock()
+        resolve_identities(['alias1', 'unknown'], self._TEST_DEVOPS_ORGANIZATION, return_errors=True)
+        looked_up = [call[1]['filter_value'] for call in self.identity_client.read_identities.call_args_list]
+        self.assertEqual(set(looked_up), {'unknown'})
+
+
+if __name__ == '__main__':
+    unittest.main()
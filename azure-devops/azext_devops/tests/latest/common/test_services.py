@@ -3,22 +3,33 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import shutil
+import tempfile
 import unittest
 
 try:
     # Attempt to load mock (works on Python 3.3 and above)
-    from unittest.mock import patch
+    from unittest.mock import MagicMock, patch
 except ImportError:
     # Attempt to load mock (works on Python version below 3.3)
-    from mock import patch
+    from mock import MagicMock, patch
 
 from knack.util import CLIError
+from msrest.authentication import BasicAuthentication
 
 from azext_devops.dev.common.telemetry import (set_tracking_data, 
     try_send_telemetry_data, vsts_tracking_data)
 
+from azext_devops.devops_sdk._file_cache import FileCache
+from azext_devops.devops_sdk.v5_0.location.models import ConnectionData, Identity
 from azext_devops.dev.common.services import (get_connection,
                                               clear_connection_cache,
+                                              forget_cached_tenants,
+                                              _get_credentials,
+                                              get_connection_data,
+                                              get_model_serializers,
+                                              get_token_from_az_logins,
                                               resolve_instance,
                                               resolve_instance_project_and_repo,
                                               check_organization_in_azure)
@@ -81,6 +92,104 @@ class TestServicesMethods(unittest.TestCase):
         showWarning = check_organization_in_azure(self._TEST_ADO_SERVER_ORGANIZATION)
         self.assertEqual(False, showWarning)
 
+    def test_get_credentials_resolved_once_per_organization(self):
+        with patch('azext_devops.dev.common.services.get_credential', return_value='pat') as mock_get_credential, \
+                patch('azext_devops.dev.common.services.get_token_from_az_logins', return_value='') as mock_az_login:
+            credentials = _get_credentials(self._TEST_DEVOPS_ORGANIZATION)
+            self.assertIs(credentials, _get_credentials(self._TEST_DEVOPS_ORGANIZATION.lower()))
+            self.assertEqual(credentials.password, 'pat')
+            mock_get_credential.assert_called_once()
+            mock_az_login.assert_called_once_with(self._TEST_DEVOPS_ORGANIZATION, True)
+            with patch('azext_devops.dev.common.telemetry.try_send_telemetry_data'):
+                self.assertIs(get_connection(self._TEST_DEVOPS_ORGANIZATION).credentials, credentials)
+
+    def test_get_connection_data_is_cached_per_credential(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        connection_data = ConnectionData(authenticated_user=Identity(id='user-id', provider_display_name='User'))
+        location_client = MagicMock()
+        location_client.get_connection_data.return_value = connection_data
+        connection = MagicMock()
+        connection.credentials = BasicAuthentication('', 'pat')
+        with patch('azext_devops.dev.common.services._connection_data_cache',
+                   FileCache(os.path.join(cache_dir, 'c.db'))), \
+                patch('azext_devops.dev.common.services._connection_data', {}) as process_cache, \
+                patch('azext_devops.dev.common.services.get_connection', return_value=connection), \
+                patch('azext_devops.dev.common.services.get_location_client', return_value=location_client):
+            get_connection_data(self._TEST_DEVOPS_ORGANIZATION)
+            # a new process only has the file cache
+            process_cache.clear()
+            cached = get_connection_data(self._TEST_DEVOPS_ORGANIZATION)
+            self.assertEqual(cached.authenticated_user.id, 'user-id')
+            location_client.get_connection_data.assert_called_once()
+            # another credential gets its own entry
+            process_cache.clear()
+            connection.credentials = BasicAuthentication('', 'other-pat')
+            get_connection_data(self._TEST_DEVOPS_ORGANIZATION)
+            self.assertEqual(location_client.get_connection_data.call_count, 2)
+
+    def test_model_serializers_are_built_once(self):
+        from azext_devops.devops_sdk.v5_0.location import models
+        from azext_devops.devops_sdk.client import Client
+        with patch.object(Client, '_model_registry', {}), \
+                patch('azext_devops.devops_sdk.client.Serializer') as mock_serializer:
+            serializers = get_model_serializers(models)
+            self.assertIs(get_model_serializers(models), serializers)
+            self.assertIs(Client._get_model_registry(models), serializers)
+            mock_serializer.assert_called_once()
+
+    def _patch_az_login(self, tenants):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        subscriptions = [{'isDefault': index == 0, 'tenantId': tenant, 'user': {'name': 'user@contoso.com'}}
+                         for index, tenant in enumerate(tenants)]
+        patchers = [
+            patch('azext_devops.dev.common.services._tenant_cache', FileCache(os.path.join(cache_dir, 't.db'))),
+            patch('azext_devops.dev.common.services._organizations_using_cached_tenant', set()),
+            patch('azext_devops.dev.common.services.Profile'),
+            patch('azext_devops.dev.common.services.get_token_from_az_login',
+                  side_effect=lambda profile, tenant: 'token-' + tenant),
+            patch('azext_devops.dev.common.services.validate_token_for_instance',
+                  side_effect=lambda organization, credentials: credentials.password == 'token-tenant2')]
+        mocks = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        mocks[2].return_value.load_cached_subscriptions.return_value = subscriptions
+        return mocks[4]
+
+    def test_get_token_from_az_logins_caches_validated_tenant(self):
+        mock_validate = self._patch_az_login(['tenant1', 'tenant2', 'tenant3'])
+        token = get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        self.assertEqual(token, 'token-tenant2')
+        validate_count = mock_validate.call_count
+        # the cached tenant is used without validating it again
+        token = get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        self.assertEqual(token, 'token-tenant2')
+        self.assertEqual(mock_validate.call_count, validate_count)
+
+    def test_forget_cached_tenants_after_authentication_failure(self):
+        mock_validate = self._patch_az_login(['tenant1', 'tenant2'])
+        get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        validate_count = mock_validate.call_count
+        forget_cached_tenants()
+        get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        self.assertGreater(mock_validate.call_count, validate_count)
+
+    def test_get_token_from_az_logins_probes_tenants_concurrently(self):
+        import threading
+        probing = threading.Barrier(3, timeout=5)
+        mock_validate = self._patch_az_login(['tenant1', 'tenant2', 'tenant3'])
+        validate = mock_validate.side_effect
+
+        def validate_after_all_probes_started(organization, credentials):
+            # fails with BrokenBarrierError unless all three probes run at the same time
+            probing.wait()
+            return validate(organization, credentials)
+        mock_validate.side_effect = validate_after_all_probes_started
+        token = get_token_from_az_logins(self._TEST_DEVOPS_ORGANIZATION, False)
+        self.assertEqual(token, 'token-tenant2')
+
     ORG_ERROR_STRING = ('--organization must be specified. The value should be the URI of your Azure DevOps '
                     'organization, for example: https://dev.azure.com/MyOrganization/ or your Azure DevOps Server organization. '
                     'You can set a default value by running: az devops configure --defaults '
@@ -72,3 +72,31 @@ class Test_VstsGitUrlInfo_Methods(unittest.TestCase):
                 get_vsts_info_url_param = mock_get_vsts_info.call_args_list[0][0]
                 self.assertEqual(
                     'https://organization@dev.azure.com/organization/project/_git/repository'.lower(), get_vsts_info_url_param[0])
+
+    def test_parse_remote_url(self):
+        expected = {
+            'https://dev.azure.com/Organization/My%20Project/_git/Repository':
+                ('https://dev.azure.com/Organization', 'My Project', 'Repository'),
+            'https://organization@dev.azure.com/organization/project/_git/repository':
+                ('https://dev.azure.com/organization', 'project', 'repository'),
+            'https://organization.visualstudio.com/project/_git/repository':
+                ('https://organization.visualstudio.com', 'project', 'repository'),
+            'https://dev.azure.com/organization/_git/project':
+                ('https://dev.azure.com/organization', 'project', 'project'),
+            'git@ssh.dev.azure.com:v3/organization/project/repository':
+                ('https://dev.azure.com/organization', 'project', 'repository'),
+            'organization@vs-ssh.visualstudio.com:v3/organization/project/repository':
+                ('https://organization.visualstudio.com', 'project', 'repository')}
+        for remote_url, (server_url, project, repository) in expected.items():
+            info = VstsGitUrlInfo.parse_remote_url(remote_url)
+            self.assertEqual((info.server_url, info.project, info.repository), (server_url, project, repository))
+        self.assertIsNone(VstsGitUrlInfo.parse_remote_url('https://mseng.visualstudio.com/DefaultCollection/VSOnline/_git/_full/VSO'))
+        self.assertIsNone(VstsGitUrlInfo.parse_remote_url('http://tfs:8080/tfs/DefaultCollection/project/_git/repository'))
+
+    def test_canonical_remote_url_is_resolved_without_server_call(self):
+        with patch('azext_devops.dev.common.vsts_git_url_info.VstsGitUrlInfo.get_vsts_info') as mock_get_vsts_info:
+            info = VstsGitUrlInfo('https://dev.azure.com/organization/project/_git/repository-not-in-cache')
+            mock_get_vsts_info.assert_not_called()
+            self.assertEqual(info.uri, 'https://dev.azure.com/organization')
+            self.assertEqual(info.project, 'project')
+            self.assertEqual(info.repo, 'repository-not-in-cache')
@@ -0,0 +1,75 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+import gc
+import threading
+import time
+import unittest
+
+from azext_devops.devops_sdk.async_client import AsyncClient
+
+
+class _FakeClient(object):
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_work_item(self, id):  # pylint: disable=redefined-builtin
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        if id < 0:
+            raise ValueError(id)
+        return {'id': id}
+
+
+class TestAsyncClientMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.client = _FakeClient()
+        self.async_client = AsyncClient(self.client, max_concurrency=3)
+
+    def tearDown(self):
+        self.async_client.close()
+
+    def test_operation_is_awaitable(self):
+        result = asyncio.run(self.async_client.get_work_item(id=7))
+        self.assertEqual(result, {'id': 7})
+
+    def test_gather_bounds_concurrency_and_keeps_order(self):
+        results = asyncio.run(self.async_client.gather('get_work_item', [{'id': i} for i in range(20)]))
+        self.assertEqual([r['id'] for r in results], list(range(20)))
+        self.assertLessEqual(self.client.max_in_flight, 3)
+
+    def test_gather_return_exceptions(self):
+        results = asyncio.run(self.async_client.gather('get_work_item', [{'id': 1}, {'id': -1}],
+                                                       return_exceptions=True))
+        self.assertEqual(results[0], {'id': 1})
+        self.assertIsInstance(results[1], ValueError)
+
+    def test_semaphores_do_not_keep_closed_loops_alive(self):
+        for _ in range(3):
+            asyncio.run(self.async_client.get_work_item(id=1))
+        gc.collect()
+        self.assertEqual(len(self.async_client._semaphores), 0)
+
+    def test_close_leaves_shared_executor_running(self):
+        shared_client = AsyncClient(self.client, executor=self.async_client._executor)
+        shared_client.close()
+        self.assertEqual(asyncio.run(self.async_client.get_work_item(id=2)), {'id': 2})
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncClient(self.client, max_concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import MagicMock, patch
+
+from azext_devops.devops_sdk.client import Client
+from azext_devops.devops_sdk._models import ApiResourceLocation
+
+
+class _ResponseValue(object):
+    def __init__(self, value, continuation_token):
+        self.value = value
+        self.continuation_token = continuation_token
+
+
+class TestClientMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+
+    def setUp(self):
+        self.client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+
+    def _list_method_from_pages(self, pages):
+        """Mimics a v5_0 list method: returns the page, leaves the token in the response state."""
+        def list_method(continuation_token=None, **kwargs):  # pylint: disable=unused-argument
+            value, next_token = pages[continuation_token]
+            self.client._response_state.continuation_token = next_token
+            return value
+        return MagicMock(side_effect=list_method)
+
+    def test_paged_iterator_follows_continuation_tokens(self):
+        list_method = self._list_method_from_pages({None: ([1, 2], 'a'), 'a': ([3, 4], 'b'), 'b': ([5], None)})
+        items = self.client.get_paged_iterator(list_method, project='p')
+        self.assertEqual(list(items), [1, 2, 3, 4, 5])
+        self.assertEqual(list_method.call_count, 3)
+        list_method.assert_called_with(continuation_token='b', project='p')
+
+    def test_paged_iterator_is_lazy(self):
+        list_method = self._list_method_from_pages({None: ([1, 2], 'a'), 'a': ([3], None)})
+        items = self.client.get_paged_iterator(list_method)
+        self.assertEqual(list_method.call_count, 0)
+        self.assertEqual(next(items), 1)
+        self.assertEqual(next(items), 2)
+        self.assertEqual(list_method.call_count, 1)
+        self.assertEqual(next(items), 3)
+        self.assertEqual(list_method.call_count, 2)
+
+    def test_paged_iterator_max_items(self):
+        list_method = self._list_method_from_pages({None: ([1, 2], 'a'), 'a': ([3, 4], None)})
+        items = self.client.get_paged_iterator(list_method, max_items=2)
+        self.assertEqual(list(items), [1, 2])
+        self.assertEqual(list_method.call_count, 1)
+
+    def test_paged_iterator_response_value_wrapper(self):
+        pages = {None: _ResponseValue([1], 'a'), 'a': _ResponseValue([2], None)}
+        list_method = MagicMock(side_effect=lambda continuation_token=None: pages[continuation_token])
+        self.assertEqual(list(self.client.get_paged_iterator(list_method)), [1, 2])
+
+    def test_paged_iterator_stops_on_repeated_token(self):
+        list_method = self._list_method_from_pages({None: ([1], 'a'), 'a': ([2], 'a')})
+        self.assertEqual(list(self.client.get_paged_iterator(list_method)), [1, 2])
+        self.assertEqual(list_method.call_count, 2)
+
+    def test_resource_location_index(self):
+        locations = [ApiResourceLocation(id='id-{}'.format(i), area='area', resource_name='r{}'.format(i))
+                     for i in range(300)]
+        Client._locations_cache.pop(self.client.config.base_url, None)
+        with patch.object(Client, '_get_resource_locations', return_value=locations) as mock_get_locations:
+            self.assertIs(self.client._get_resource_location('id-250'), locations[250])
+            self.assertIs(self.client._get_resource_location('id-3'), locations[3])
+            self.assertIsNone(self.client._get_resource_location('unknown'))
+            mock_get_locations.assert_called_once_with(all_host_types=False)
+        Client._locations_cache.pop(self.client.config.base_url, None)
+
+    def test_resource_locations_of_different_urls_are_fetched_concurrently(self):
+        clients = [Client(base_url=self._TEST_DEVOPS_ORGANIZATION + '/concurrent{}'.format(i)) for i in range(2)]
+        # each fetch waits for the other one, so this only completes if both run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_resource_locations(all_host_types):  # pylint: disable=unused-argument
+            barrier.wait()
+            return [ApiResourceLocation(id='id', area='area', resource_name='r')]
+
+        results = []
+
+        def get_resource_location(client):
+            results.append(client._get_resource_location('id'))
+
+        with patch.object(Client, '_get_resource_locations', side_effect=get_resource_locations):
+            threads = [threading.Thread(target=get_resource_location, args=(client,)) for client in clients]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for client in clients:
+            Client._locations_cache.pop(client.config.base_url, None)
+        self.assertEqual([location.id for location in results], ['id', 'id'])
+
+    def test_stale_options_are_served_and_refreshed_in_background(self):
+        cached_locations = [{'id': 'a', 'area': 'core', 'resourceName': 'projects'}]
+        mock_cache = MagicMock()
+        mock_cache.__getitem__.return_value = cached_locations
+        mock_cache.is_stale.return_value = True
+        with patch('azext_devops.devops_sdk.client.OPTIONS_FILE_CACHE', mock_cache), \
+                patch('azext_devops.devops_sdk.client.refresh_in_background') as mock_refresh, \
+                patch.object(Client, '_fetch_resource_locations') as mock_fetch:
+            locations = self.client._get_resource_locations(all_host_types=False)
+        self.assertEqual(locations[0].id, 'a')
+        mock_fetch.assert_not_called()
+        mock_refresh.assert_called_once()
+        self.assertEqual(mock_refresh.call_args[0][:2], (mock_cache, self.client.normalized_url))
+
+    def test_negotiate_request_version(self):
+        location = ApiResourceLocation(id='negotiate-test', min_version=1.0, max_version=5.1,
+                                       released_version='5.0', resource_version=2)
+        self.assertEqual(Client._negotiate_request_version(location, '5.0'), '5.0')
+        self.assertEqual(Client._negotiate_request_version(location, '5.0-preview.3'), '5.0-preview.2')
+        self.assertEqual(Client._negotiate_request_version(location, '6.0'), '5.1-preview')
+        with patch('azext_devops.devops_sdk.client.re.match') as mock_match:
+            self.assertEqual(Client._negotiate_request_version(location, '5.0-preview.3'), '5.0-preview.2')
+            mock_match.assert_not_called()
+        self.assertIsNone(Client._negotiate_request_version(None, None))
+
+    def test_model_registry_shared_between_client_instances(self):
+        from azext_devops.devops_sdk.v5_0.git.git_client import GitClient
+        from azext_devops.devops_sdk.v5_0.core.core_client import CoreClient
+        git_client = GitClient(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        git_client2 = GitClient(base_url=self._TEST_DEVOPS_ORGANIZATION + '2')
+        core_client = CoreClient(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        self.assertIs(git_client._deserialize, git_client2._deserialize)
+        self.assertIs(git_client._serialize, git_client2._serialize)
+        self.assertIsNot(git_client._deserialize, core_client._deserialize)
+        self.assertIs(git_client._base_deserialize, core_client._base_deserialize)
+        self.assertIn('GitRepository', git_client._deserialize.dependencies)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+import requests
+from msrest.authentication import BasicAuthentication
+from msrest.universal_http import ClientRequest
+
+from azext_devops.devops_sdk import connection as connection_module
+from azext_devops.devops_sdk._file_cache import FileCache
+from azext_devops.devops_sdk._models import ResourceAreaInfo
+from azext_devops.devops_sdk.connection import Connection
+from azext_devops.devops_sdk.v5_0.location.location_client import LocationClient
+
+
+class TestConnectionMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+    _CORE_CLIENT = 'azext_devops.devops_sdk.v5_0.core.core_client.CoreClient'
+    _GIT_CLIENT = 'azext_devops.devops_sdk.v5_0.git.git_client.GitClient'
+
+    def setUp(self):
+        self.connection = Connection(base_url=self._TEST_DEVOPS_ORGANIZATION,
+                                     creds=BasicAuthentication('', 'token'))
+        # every resource area resolves to the organization url
+        self.connection._resource_areas = []
+
+    def test_clients_send_on_connection_session(self):
+        core_client = self.connection.get_client(self._CORE_CLIENT)
+        git_client = self.connection.get_client(self._GIT_CLIENT)
+        for client in (core_client, git_client):
+            client.set_rate_limiter(None)
+        adapter = self.connection.get_session().get_adapter('https://dev.azure.com')
+
+        def send(request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b'{}'
+            response.request = request
+            response.url = request.url
+            return response
+
+        # more requests than the recursion limit, which re-initializing the session per call used to hit
+        with patch.object(adapter, 'send', side_effect=send) as mock_send:
+            for index in range(1100):
+                client = core_client if index % 2 else git_client
+                client._send_request(ClientRequest('GET', self._TEST_DEVOPS_ORGANIZATION + '/_apis/projects'))
+        self.assertEqual(mock_send.call_count, 1100)
+
+    def test_session_pool_size(self):
+        connection = Connection(base_url=self._TEST_DEVOPS_ORGANIZATION, pool_size=25)
+        adapter = connection.get_session().get_adapter('https://dev.azure.com')
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(adapter._pool_connections, 25)
+
+    def test_async_clients_share_connection_executor(self):
+        core_client = self.connection.get_async_client(self._CORE_CLIENT)
+        git_client = self.connection.get_async_client(self._GIT_CLIENT, max_concurrency=2)
+        self.assertIs(core_client._executor, git_client._executor)
+        self.assertEqual(core_client.max_concurrency, 10)
+        core_client.close()
+        self.assertIs(self.connection.get_async_client(self._CORE_CLIENT)._executor, git_client._executor)
+
+    def test_client_factories_are_created_on_first_use(self):
+        self.assertIsNone(self.connection._clients_v5_0)
+        factory = self.connection.clients_v5_0
+        self.assertIs(factory, self.connection.clients_v5_0)
+        self.assertIs(factory._connection, self.connection)
+        self.assertIsNone(self.connection._clients_v5_1)
+
+    def test_deployment_resource_area_is_cached_on_disk(self):
+        cache_dir = tempfile.mkdtemp()
+        area_id = '3B95FB80-FDF2-4D15-A4F4-8F5A2F2E7F4A'
+        resource_area = ResourceAreaInfo(id=area_id.lower(), location_url='https://vsblob.dev.azure.com', name='blob')
+        try:
+            with patch.object(connection_module, 'RESOURCE_FILE_CACHE', FileCache(os.path.join(cache_dir, 'r.db'))), \
+                    patch.object(connection_module, '_deployment_level_resource_areas', {}), \
+                    patch.object(LocationClient, 'get_resource_area', return_value=resource_area) as mock_get:
+                self.connection._get_deployment_resource_area_from_sps(area_id)
+                # a new process only has the disk cache
+                connection_module._deployment_level_resource_areas.clear()
+                connection_module.RESOURCE_FILE_CACHE = FileCache(os.path.join(cache_dir, 'r.db'))
+                cached = self.connection._get_deployment_resource_area_from_sps(area_id)
+            mock_get.assert_called_once()
+            self.assertEqual(cached.location_url, 'https://vsblob.dev.azure.com')
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
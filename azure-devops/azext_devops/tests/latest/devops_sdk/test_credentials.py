@@ -0,0 +1,41 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import json
+import unittest
+
+from azext_devops.devops_sdk.credentials import (BasicAuthentication, BasicTokenAuthentication,
+                                                 get_credential_fingerprint)
+
+
+def create_aad_token(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode('utf-8')).decode('utf-8').rstrip('=')
+    return 'header.' + payload + '.signature'
+
+
+class TestCredentialsMethods(unittest.TestCase):
+
+    def test_fingerprint_of_aad_token_is_stable_across_refreshes(self):
+        first = BasicAuthentication('', create_aad_token({'tid': 'tenant', 'oid': 'user', 'exp': 1}))
+        refreshed = BasicTokenAuthentication(
+            {'access_token': create_aad_token({'tid': 'tenant', 'oid': 'user', 'exp': 2})})
+        other = BasicAuthentication('', create_aad_token({'tid': 'tenant', 'oid': 'other-user', 'exp': 1}))
+        self.assertEqual(get_credential_fingerprint(first), get_credential_fingerprint(refreshed))
+        self.assertNotEqual(get_credential_fingerprint(first), get_credential_fingerprint(other))
+
+    def test_fingerprint_of_pat(self):
+        fingerprint = get_credential_fingerprint(BasicAuthentication('', 'pat'))
+        self.assertEqual(len(fingerprint), 64)
+        self.assertNotEqual(fingerprint, get_credential_fingerprint(BasicAuthentication('', 'other-pat')))
+
+    def test_unidentifiable_credentials_have_no_fingerprint(self):
+        self.assertIsNone(get_credential_fingerprint(None))
+        self.assertIsNone(get_credential_fingerprint(BasicAuthentication('', '')))
+        self.assertIsNone(get_credential_fingerprint(object()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+from azext_devops.devops_sdk._file_cache import FileCache, get_cache, refresh_in_background
+
+
+class TestFileCacheMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_entries_are_shared_between_instances(self):
+        writer = get_cache('test', cache_dir=self.cache_dir)
+        writer['org1'] = {'a': 1}
+        writer['org2'] = [1, 2]
+        reader = get_cache('test', cache_dir=self.cache_dir)
+        self.assertEqual(reader['org1'], {'a': 1})
+        self.assertEqual(reader.get('org2'), [1, 2])
+        self.assertEqual(sorted(reader), ['org1', 'org2'])
+        del writer['org1']
+        self.assertEqual(get_cache('test', cache_dir=self.cache_dir)['org1'], {})
+
+    def test_missing_key_returns_empty_value(self):
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        self.assertIsNone(cache.get('missing'))
+        self.assertFalse(cache['missing'])
+
+    def test_entries_expire_individually(self):
+        cache = get_cache('test', max_age=3600, cache_dir=self.cache_dir)
+        cache['fresh'] = 1
+        cache.set('stale', 2, max_age=1)
+        cache._db.execute('UPDATE entries SET expires = ? WHERE key = ?', (time.time() - 1, 'stale'))
+        reader = get_cache('test', max_age=3600, cache_dir=self.cache_dir)
+        self.assertEqual(reader.get('fresh'), 1)
+        self.assertIsNone(reader.get('stale'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = FileCache(os.path.join(self.cache_dir, 'test.db'), max_entries=3)
+        for index in range(3):
+            cache[str(index)] = index
+            cache._db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (index, str(index)))
+        # reading an entry makes it the most recently used one
+        FileCache(cache.file_name).get('0')
+        cache['3'] = 3
+        reader = FileCache(cache.file_name)
+        self.assertEqual(sorted(reader), ['0', '2', '3'])
+
+    def test_json_cache_file_is_imported(self):
+        with open(os.path.join(self.cache_dir, 'test.json'), 'w') as json_file:
+            json_file.write(json.dumps({'org1': {'a': 1}}))
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        self.assertEqual(cache['org1'], {'a': 1})
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'test.json')))
+
+    def test_corrupt_cache_file_is_replaced(self):
+        with open(os.path.join(self.cache_dir, 'test.db'), 'w') as db_file:
+            db_file.write('not a database')
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        self.assertIsNone(cache.get('org1'))
+        cache['org1'] = 1
+        self.assertEqual(get_cache('test', cache_dir=self.cache_dir).get('org1'), 1)
+
+    def test_is_stale(self):
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        cache['org1'] = 1
+        self.assertFalse(cache.is_stale('org1', max_age=60))
+        self.assertFalse(cache.is_stale('missing', max_age=60))
+        cache._db.execute('UPDATE entries SET updated = ?', (time.time() - 120,))
+        self.assertTrue(get_cache('test', cache_dir=self.cache_dir).is_stale('org1', max_age=60))
+
+    def test_save_only_writes_modified_entries(self):
+        writer = get_cache('test', cache_dir=self.cache_dir)
+        writer['read'] = 1
+        writer['changed'] = {'a': 1}
+        writer._db.execute('UPDATE entries SET updated = ?', (1000,))
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        cache.get('read')
+        cache['changed']['b'] = 2
+        self.assertFalse(cache['missing'])
+        cache.save()
+        rows = dict(cache._db.execute('SELECT key, updated FROM entries').fetchall())
+        self.assertEqual(rows['read'], 1000)
+        self.assertGreater(rows['changed'], 1000)
+        self.assertNotIn('missing', rows)
+        self.assertEqual(get_cache('test', cache_dir=self.cache_dir)['changed'], {'a': 1, 'b': 2})
+
+    def test_concurrent_first_use_loads_once(self):
+        get_cache('test', cache_dir=self.cache_dir)['org1'] = 1
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        open_db = FileCache._open
+        opened = []
+
+        def slow_open(file_cache):
+            opened.append(1)
+            time.sleep(0.05)
+            return open_db(file_cache)
+
+        results = []
+        with patch.object(FileCache, '_open', autospec=True, side_effect=slow_open):
+            threads = [threading.Thread(target=lambda: results.append(cache.get('org1'))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, [1] * 4)
+        self.assertEqual(len(opened), 1)
+
+    def test_refresh_in_background(self):
+        cache = get_cache('test', cache_dir=self.cache_dir)
+        cache['org1'] = 'stale'
+        thread = refresh_in_background(cache, 'org1', lambda: 'fresh')
+        thread.join()
+        self.assertEqual(cache['org1'], 'fresh')
+        self.assertEqual(get_cache('test', cache_dir=self.cache_dir)['org1'], 'fresh')
+
+
+if __name__ == '__main__':
+    unittest.main()
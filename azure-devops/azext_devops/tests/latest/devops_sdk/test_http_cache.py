@@ -0,0 +1,178 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import patch
+
+import requests
+from msrest.authentication import BasicAuthentication
+from msrest.universal_http import ClientRequest
+from requests.structures import CaseInsensitiveDict
+
+from azext_devops.devops_sdk._http_cache import HttpCache
+from azext_devops.devops_sdk._models import ApiResourceLocation
+from azext_devops.devops_sdk.client import Client
+from .test_credentials import create_aad_token
+
+
+def _create_response(status_code, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    return response
+
+
+class TestHttpCacheMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+    _LOCATION_ID = '0d55247a-1c47-4462-9b1f-5e2125590ee6'
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_store_and_get_entry(self):
+        cache = HttpCache(self.cache_dir)
+        cache.store('url', _create_response(200, b'{"id": 1}', {'ETag': '"1"',
+                                                                 'Content-Type': 'application/json; charset=utf-8'}))
+        entry = cache.get('url')
+        self.assertEqual(entry.etag, '"1"')
+        self.assertEqual(entry.body, '{"id": 1}')
+        self.assertIsNone(cache.get('other-url'))
+
+    def test_responses_without_validator_are_not_stored(self):
+        cache = HttpCache(self.cache_dir)
+        cache.store('url', _create_response(200, b'{"id": 1}', {'Content-Type': 'application/json'}))
+        cache.store('zip', _create_response(200, b'PK', {'ETag': '"1"', 'Content-Type': 'application/zip'}))
+        self.assertIsNone(cache.get('url'))
+        self.assertIsNone(cache.get('zip'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        body = b'{"value": "' + b'x' * 100 + b'"}'
+        cache = HttpCache(self.cache_dir, max_size=4000)
+        for index in range(16):
+            cache.store(str(index), _create_response(200, body, {'ETag': str(index),
+                                                                  'Content-Type': 'application/json'}))
+            # make the write order visible to the mtime based eviction
+            file_name = cache._get_file_name(str(index))
+            os.utime(file_name, (1000 + index, 1000 + index))
+        self.assertIsNotNone(cache.get('0'))
+        for index in range(16, 20):
+            cache.store(str(index), _create_response(200, body, {'ETag': str(index),
+                                                                  'Content-Type': 'application/json'}))
+        self.assertIsNotNone(cache.get('0'))
+        self.assertIsNone(cache.get('1'))
+        self.assertIsNotNone(cache.get('19'))
+        total_size = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in os.listdir(self.cache_dir))
+        self.assertLessEqual(total_size, 4000)
+
+    def test_directory_is_only_listed_when_size_may_exceed_limit(self):
+        body = b'{"value": "' + b'x' * 100 + b'"}'
+        cache = HttpCache(self.cache_dir, max_size=4000)
+        with patch.object(HttpCache, '_list_files', autospec=True, side_effect=HttpCache._list_files) as mock_list:
+            for index in range(10):
+                cache.store(str(index), _create_response(200, body, {'ETag': str(index),
+                                                                      'Content-Type': 'application/json'}))
+            self.assertEqual(mock_list.call_count, 1)
+            for index in range(10, 30):
+                cache.store(str(index), _create_response(200, body, {'ETag': str(index),
+                                                                      'Content-Type': 'application/json'}))
+            self.assertLessEqual(mock_list.call_count, 5)
+        total_size = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in os.listdir(self.cache_dir))
+        self.assertLessEqual(total_size, 4000)
+        self.assertEqual(cache._size, total_size)
+
+    def test_client_send_revalidates_with_conditional_request(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        client.set_http_cache(HttpCache(self.cache_dir))
+        location = ApiResourceLocation(id=self._LOCATION_ID, area='core', resource_name='projects',
+                                       route_template='_apis/{resource}', resource_version=1, min_version=1.0,
+                                       max_version=5.0, released_version='5.0')
+        sent_headers = []
+
+        def send_request(request, headers=None, content=None, media_type=None):
+            sent_headers.append(dict(headers))
+            if 'If-None-Match' in headers:
+                return _create_response(304, headers={'ETag': '"1"'})
+            return _create_response(200, b'{"name": "project"}', {'ETag': '"1"',
+                                                                   'Content-Type': 'application/json'})
+
+        with patch.object(Client, '_get_resource_location', return_value=location), \
+                patch.object(Client, '_send_request', side_effect=send_request):
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            response = client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+        self.assertNotIn('If-None-Match', sent_headers[0])
+        self.assertEqual(sent_headers[1]['If-None-Match'], '"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'name': 'project'})
+        self.assertEqual(client._http_cache.hits, 1)
+
+    def test_client_send_keeps_entries_per_credential(self):
+        location = ApiResourceLocation(id=self._LOCATION_ID, area='core', resource_name='projects',
+                                       route_template='_apis/{resource}', resource_version=1, min_version=1.0,
+                                       max_version=5.0, released_version='5.0')
+        sent_headers = []
+
+        def send_request(request, headers=None, content=None, media_type=None):
+            sent_headers.append(dict(headers))
+            return _create_response(200, b'{"name": "project"}', {'ETag': '"1"',
+                                                                   'Content-Type': 'application/json'})
+
+        with patch.object(Client, '_get_resource_location', return_value=location), \
+                patch.object(Client, '_send_request', side_effect=send_request):
+            for password in ('pat', 'other-pat'):
+                client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION, creds=BasicAuthentication('', password))
+                client.set_http_cache(HttpCache(self.cache_dir))
+                client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+        self.assertNotIn('If-None-Match', sent_headers[0])
+        self.assertNotIn('If-None-Match', sent_headers[1])
+
+    def test_client_send_revalidates_after_aad_token_refresh(self):
+        location = ApiResourceLocation(id=self._LOCATION_ID, area='core', resource_name='projects',
+                                       route_template='_apis/{resource}', resource_version=1, min_version=1.0,
+                                       max_version=5.0, released_version='5.0')
+        sent_headers = []
+
+        def send_request(request, headers=None, content=None, media_type=None):
+            sent_headers.append(dict(headers))
+            if 'If-None-Match' in headers:
+                return _create_response(304, headers={'ETag': '"1"'})
+            return _create_response(200, b'{"name": "project"}', {'ETag': '"1"',
+                                                                   'Content-Type': 'application/json'})
+
+        with patch.object(Client, '_get_resource_location', return_value=location), \
+                patch.object(Client, '_send_request', side_effect=send_request):
+            for expires in (1, 2):
+                token = create_aad_token({'tid': 'tenant', 'oid': 'user', 'exp': expires})
+                client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION, creds=BasicAuthentication('', token))
+                client.set_http_cache(HttpCache(self.cache_dir))
+                client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+        self.assertEqual(sent_headers[1]['If-None-Match'], '"1"')
+
+    def test_client_send_returns_not_modified_without_cache_entry(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        client.set_http_cache(HttpCache(self.cache_dir))
+        request = ClientRequest('GET', self._TEST_DEVOPS_ORGANIZATION + '/_apis/projects')
+        with patch.object(Client, '_send_request', return_value=_create_response(304, headers={'ETag': '"1"'})):
+            response = client._send_get_request(request=request,
+                                                headers={'Accept': 'application/json', 'If-None-Match': '"1"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(client._http_cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import MagicMock, patch
+
+from azext_devops.devops_sdk._request_cache import RequestCache
+from azext_devops.devops_sdk._models import ApiResourceLocation
+from azext_devops.devops_sdk.client import Client
+
+
+class TestRequestCacheMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+    _LOCATION_ID = '0d55247a-1c47-4462-9b1f-5e2125590ee6'
+
+    def test_get_or_send_caches_responses(self):
+        cache = RequestCache()
+        send = MagicMock(return_value='response')
+        self.assertEqual(cache.get_or_send(('GET', 'url'), send), 'response')
+        self.assertEqual(cache.get_or_send(('GET', 'url'), send), 'response')
+        send.assert_called_once()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_errors_are_not_cached(self):
+        cache = RequestCache()
+        send = MagicMock(side_effect=[ValueError('boom'), 'response'])
+        with self.assertRaises(ValueError):
+            cache.get_or_send(('GET', 'url'), send)
+        self.assertEqual(cache.get_or_send(('GET', 'url'), send), 'response')
+        self.assertEqual(send.call_count, 2)
+
+    def test_in_flight_requests_are_coalesced(self):
+        cache = RequestCache()
+        release = threading.Event()
+        send_count = []
+
+        def send():
+            send_count.append(1)
+            release.wait()
+            return 'response'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_send(('GET', 'url'), send)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while cache.hits + cache.misses < 5:
+            pass
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['response'] * 5)
+        self.assertEqual(len(send_count), 1)
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+
+    def test_client_send_uses_cache_for_get_and_clears_on_write(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        client.set_request_cache(RequestCache())
+        location = ApiResourceLocation(id=self._LOCATION_ID, area='core', resource_name='projects',
+                                       route_template='_apis/{resource}', resource_version=1, min_version=1.0,
+                                       max_version=5.0, released_version='5.0')
+        response = MagicMock(headers={'Content-Type': 'application/json; charset=utf-8'})
+        with patch.object(Client, '_get_resource_location', return_value=location), \
+                patch.object(Client, '_send_request', return_value=response) as mock_send_request:
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            self.assertEqual(mock_send_request.call_count, 1)
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0',
+                         query_parameters={'$top': 1})
+            self.assertEqual(mock_send_request.call_count, 2)
+            client._send(http_method='PATCH', location_id=self._LOCATION_ID, version='5.0')
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            self.assertEqual(mock_send_request.call_count, 4)
+
+    def test_only_the_most_recent_responses_are_kept(self):
+        cache = RequestCache(max_entries=2)
+        for url in ('url1', 'url2', 'url1', 'url3'):
+            cache.get_or_send(('GET', url), lambda: 'response')
+        self.assertEqual(len(cache), 2)
+        send = MagicMock(return_value='response')
+        cache.get_or_send(('GET', 'url1'), send)
+        send.assert_not_called()
+        cache.get_or_send(('GET', 'url2'), send)
+        send.assert_called_once()
+
+    def test_client_send_does_not_share_streamed_responses(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        client.set_request_cache(RequestCache())
+        location = ApiResourceLocation(id=self._LOCATION_ID, area='core', resource_name='projects',
+                                       route_template='_apis/{resource}', resource_version=1, min_version=1.0,
+                                       max_version=5.0, released_version='5.0')
+        with patch.object(Client, '_get_resource_location', return_value=location), \
+                patch.object(Client, '_send_request',
+                             side_effect=lambda **kwargs: MagicMock(headers={'Content-Type': 'text/plain'})) \
+                as mock_send_request:
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0',
+                         accept_media_type='application/octet-stream')
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0',
+                         accept_media_type='application/octet-stream')
+            self.assertEqual(mock_send_request.call_count, 2)
+            # a json request answered with something else is not kept either
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            client._send(http_method='GET', location_id=self._LOCATION_ID, version='5.0')
+            self.assertEqual(mock_send_request.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
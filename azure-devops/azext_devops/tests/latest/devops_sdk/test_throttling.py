@@ -0,0 +1,82 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+try:
+    # Attempt to load mock (works on Python 3.3 and above)
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    # Attempt to load mock (works on Python version below 3.3)
+    from mock import MagicMock, patch
+
+from msrest.universal_http import ClientRequest
+
+from azext_devops.devops_sdk._throttling import RetryPolicy, TokenBucket, get_retry_after
+from azext_devops.devops_sdk.client import Client
+
+
+class TestThrottlingMethods(unittest.TestCase):
+
+    _TEST_DEVOPS_ORGANIZATION = 'https://dev.azure.com/AzureDevOpsCliTest'
+
+    def test_get_retry_after(self):
+        self.assertEqual(get_retry_after({'Retry-After': '5'}), 5)
+        self.assertEqual(get_retry_after({'Retry-After': 'Thu, 01 Jan 1970 00:00:00 GMT'}), 0)
+        self.assertIsNone(get_retry_after({'Retry-After': 'soon'}))
+        self.assertIsNone(get_retry_after({}))
+
+    def test_retry_policy_honours_retry_after(self):
+        policy = RetryPolicy(max_retries=2, max_backoff=30)
+        self.assertEqual(policy.get_retry_delay(MagicMock(status_code=429, headers={'Retry-After': '7'}), 0), 7)
+        self.assertIsNone(policy.get_retry_delay(MagicMock(status_code=429, headers={'Retry-After': '7'}), 2))
+        self.assertIsNone(policy.get_retry_delay(MagicMock(status_code=429, headers={'Retry-After': '90'}), 0))
+        self.assertIsNone(policy.get_retry_delay(MagicMock(status_code=404, headers={}), 0))
+        delay = policy.get_retry_delay(MagicMock(status_code=429, headers={}), 1)
+        self.assertTrue(2 <= delay <= 3)
+
+    def test_token_bucket_slows_down_on_rate_limit_headers(self):
+        bucket = TokenBucket(rate=16)
+        bucket.update({'X-RateLimit-Remaining': '5', 'X-RateLimit-Limit': '200'})
+        self.assertEqual(bucket.rate, 8)
+        bucket.update({'X-RateLimit-Delay': '0.5'})
+        self.assertEqual(bucket.rate, 4)
+        bucket.update({'X-RateLimit-Remaining': '150', 'X-RateLimit-Limit': '200'})
+        self.assertEqual(bucket.rate, 5)
+
+    def test_token_bucket_pauses_on_retry_after(self):
+        bucket = TokenBucket(rate=10)
+        bucket.update({'Retry-After': '2'})
+        with patch('azext_devops.devops_sdk._throttling.time.sleep') as mock_sleep:
+            mock_sleep.side_effect = lambda seconds: setattr(bucket, '_paused_until', 0)
+            bucket.acquire()
+        self.assertTrue(1 < mock_sleep.call_args[0][0] <= 2)
+
+    def test_send_request_retries_throttled_requests(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        ok = MagicMock(status_code=200, headers={})
+        request = ClientRequest(method='GET', url=self._TEST_DEVOPS_ORGANIZATION)
+        with patch.object(client._client, 'send', side_effect=[throttled, ok]) as mock_send, \
+                patch('azext_devops.devops_sdk.client.time.sleep') as mock_sleep:
+            response = client._send_request(request, headers={})
+        self.assertIs(response, ok)
+        self.assertEqual(mock_send.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+        throttled.close.assert_called_once()
+
+    def test_send_request_does_not_retry_streamed_content(self):
+        client = Client(base_url=self._TEST_DEVOPS_ORGANIZATION)
+        throttled = MagicMock(status_code=429, headers={'Retry-After': '1'})
+        request = ClientRequest(method='PUT', url=self._TEST_DEVOPS_ORGANIZATION)
+        with patch.object(client._client, 'send', return_value=throttled) as mock_send, \
+                patch.object(Client, '_handle_error') as mock_handle_error:
+            client._send_request(request, headers={}, content=iter([b'chunk']))
+        mock_send.assert_called_once()
+        mock_handle_error.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ from azext_devops.tests.utils.authentication import AuthenticatedTests
 from azext_devops.devops_sdk.v5_0.build.build_client import BuildClient
 from azext_devops.devops_sdk.v6_0.pipelines.pipelines_client import PipelinesClient
 from azext_devops.dev.pipelines.pipeline import pipeline_run
+from azext_devops.dev.pipelines.pipeline_run import pipeline_run_list
 from azext_devops.tests.utils.helper import get_client_mock_helper, TEST_DEVOPS_ORG_URL
 
 class TestPipelinesRun(AuthenticatedTests):
@@ -58,3 +59,16 @@ class TestPipelinesRun(AuthenticatedTests):
 
                         mock_queue_build.assert_not_called()
                         mock_run_pipeline.assert_called_once()
+
+    def test_run_list_without_top_gets_a_single_page(self):
+        with patch('azext_devops.devops_sdk.connection.Connection.get_client', new=get_client_mock_helper):
+            with patch('azext_devops.devops_sdk.v5_0.build.build_client.BuildClient.get_builds',
+                       return_value=['build']) as mock_get_builds:
+                with patch('azext_devops.devops_sdk.client.Client.get_paged_iterator') as mock_get_paged_iterator:
+                    builds = pipeline_run_list(project=self._TEST_DEVOPS_PROJECT,
+                                               organization=self._TEST_DEVOPS_ORGANIZATION)
+
+                    self.assertEqual(builds, ['build'])
+                    mock_get_builds.assert_called_once()
+                    self.assertIsNone(mock_get_builds.call_args[1]['top'])
+                    mock_get_paged_iterator.assert_not_called()
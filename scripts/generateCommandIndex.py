@@ -0,0 +1,49 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+# Regenerates azure-devops/azext_devops/_command_index.py from the full command table.
+# Run it after adding, moving or removing a command group.
+
+import os
+from azure.cli.core.mock import DummyCli
+from azext_devops import DevCommandsLoader
+
+INDEX_FILE = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'azure-devops',
+                                          'azext_devops', '_command_index.py'))
+HEADER = '''# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+# Generated file, DO NOT EDIT
+# Regenerate with scripts/generateCommandIndex.py after changing command groups.
+# --------------------------------------------------------------------------------------------
+
+# Maps every command group to the dev areas (azext_devops.dev.<area>) whose commands.py registers it.
+COMMAND_INDEX = {
+'''
+
+
+def get_command_index(cli_ctx):
+    loader = DevCommandsLoader(cli_ctx)
+    cmd_table = loader.load_command_table(None)
+    index = {}
+    for cmd_name, cmd in cmd_table.items():
+        operations_tmpl = cmd.command_kwargs['operations_tmpl']
+        area = operations_tmpl.split('#')[0].split('.')[2]
+        group = cmd_name.rsplit(' ', 1)[0]
+        index.setdefault(group, set()).add(area)
+    return index
+
+
+def write_command_index(index):
+    with open(INDEX_FILE, 'w') as index_file:
+        index_file.write(HEADER)
+        for group in sorted(index):
+            index_file.write("    '{}': {},\n".format(group, sorted(index[group])))
+        index_file.write('}\n')
+    print('Wrote {} command groups to {}'.format(len(index), INDEX_FILE))
+
+
+write_command_index(get_command_index(DummyCli()))